@@ -10,8 +10,10 @@ class UserAdmin(BaseUserAdmin):
     """
     list_display = ('email', 'username', 'first_name', 'last_name', 'role', 'is_verified', 'is_active', 'created_at')
     list_filter = ('role', 'is_verified', 'is_active', 'is_staff', 'created_at')
-    search_fields = ('email', 'username', 'first_name', 'last_name')
+    search_fields = ('email', 'username')
     ordering = ('-created_at',)
+    changelist_fields = ('id', 'email', 'username', 'first_name', 'last_name', 'role',
+                         'is_verified', 'is_active', 'created_at')
     
     fieldsets = (
         (None, {'fields': ('username', 'password')}),
@@ -27,6 +29,14 @@ class UserAdmin(BaseUserAdmin):
             'fields': ('username', 'email', 'first_name', 'last_name', 'role', 'password1', 'password2'),
         }),
     )
+    
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        # Only the changelist is narrowed; the change form needs every column
+        match = request.resolver_match
+        if match and match.url_name == 'authentication_user_changelist':
+            queryset = queryset.only(*self.changelist_fields)
+        return queryset
 
 
 @admin.register(StudentProfile)
@@ -36,8 +46,9 @@ class StudentProfileAdmin(admin.ModelAdmin):
     """
     list_display = ('user', 'student_id', 'enrollment_date', 'current_level', 'gpa')
     list_filter = ('enrollment_date', 'current_level')
-    search_fields = ('user__email', 'user__first_name', 'user__last_name', 'student_id')
+    search_fields = ('user__email', 'student_id')
     readonly_fields = ('student_id',)
+    list_select_related = ('user',)
 
 
 @admin.register(TutorProfile)
@@ -47,8 +58,9 @@ class TutorProfileAdmin(admin.ModelAdmin):
     """
     list_display = ('user', 'employee_id', 'hire_date', 'department', 'specialization')
     list_filter = ('hire_date', 'department')
-    search_fields = ('user__email', 'user__first_name', 'user__last_name', 'employee_id')
+    search_fields = ('user__email', 'employee_id')
     readonly_fields = ('employee_id',)
+    list_select_related = ('user',)
 
 
 @admin.register(AdminProfile)
@@ -58,5 +70,6 @@ class AdminProfileAdmin(admin.ModelAdmin):
     """
     list_display = ('user', 'employee_id', 'hire_date', 'department', 'position', 'permissions_level')
     list_filter = ('hire_date', 'department', 'permissions_level')
-    search_fields = ('user__email', 'user__first_name', 'user__last_name', 'employee_id')
-    readonly_fields = ('employee_id',)
\ No newline at end of file
+    search_fields = ('user__email', 'employee_id')
+    readonly_fields = ('employee_id',)
+    list_select_related = ('user',)
\ No newline at end of file
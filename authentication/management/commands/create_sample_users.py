@@ -1,95 +1,114 @@
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
 from authentication.models import StudentProfile, TutorProfile, AdminProfile
 
 User = get_user_model()
 
+SAMPLE_USERS = [
+    {
+        'label': 'admin',
+        'password': 'admin123',
+        'fields': {
+            'email': 'admin@lms.com',
+            'username': 'admin',
+            'first_name': 'System',
+            'last_name': 'Administrator',
+            'role': 'admin',
+            'is_staff': True,
+            'is_superuser': True,
+            'is_verified': True,
+        },
+        'profile_model': AdminProfile,
+        'profile': {
+            'employee_id': 'ADM000001',
+            'hire_date': '2024-01-01',
+            'department': 'IT',
+            'position': 'System Administrator',
+            'permissions_level': 'super',
+        },
+    },
+    {
+        'label': 'tutor',
+        'password': 'tutor123',
+        'fields': {
+            'email': 'tutor@lms.com',
+            'username': 'tutor',
+            'first_name': 'John',
+            'last_name': 'Smith',
+            'role': 'tutor',
+            'is_verified': True,
+        },
+        'profile_model': TutorProfile,
+        'profile': {
+            'employee_id': 'TUT000001',
+            'hire_date': '2024-01-01',
+            'department': 'Computer Science',
+            'specialization': 'Web Development, Python, Django',
+            'bio': 'Experienced software developer and educator',
+            'hourly_rate': 50.00,
+        },
+    },
+    {
+        'label': 'student',
+        'password': 'student123',
+        'fields': {
+            'email': 'student@lms.com',
+            'username': 'student',
+            'first_name': 'Jane',
+            'last_name': 'Doe',
+            'role': 'student',
+            'is_verified': True,
+        },
+        'profile_model': StudentProfile,
+        'profile': {
+            'student_id': 'STU000001',
+            'enrollment_date': '2024-01-01',
+            'current_level': 'Beginner',
+            'gpa': 3.5,
+            'emergency_contact': 'John Doe',
+            'emergency_phone': '+1234567890',
+        },
+    },
+]
+
 
 class Command(BaseCommand):
     help = 'Create sample users for testing'
 
     def handle(self, *args, **options):
-        # Create sample admin
-        admin_user, created = User.objects.get_or_create(
-            email='admin@lms.com',
-            defaults={
-                'username': 'admin',
-                'first_name': 'System',
-                'last_name': 'Administrator',
-                'role': 'admin',
-                'is_staff': True,
-                'is_superuser': True,
-                'is_verified': True,
-            }
-        )
-        if created:
-            admin_user.set_password('admin123')
-            admin_user.save()
-            AdminProfile.objects.create(
-                user=admin_user,
-                employee_id='ADM000001',
-                hire_date='2024-01-01',
-                department='IT',
-                position='System Administrator',
-                permissions_level='super'
-            )
-            self.stdout.write(
-                self.style.SUCCESS(f'Created admin user: {admin_user.email}')
-            )
+        emails = [spec['fields']['email'] for spec in SAMPLE_USERS]
 
-        # Create sample tutor
-        tutor_user, created = User.objects.get_or_create(
-            email='tutor@lms.com',
-            defaults={
-                'username': 'tutor',
-                'first_name': 'John',
-                'last_name': 'Smith',
-                'role': 'tutor',
-                'is_verified': True,
-            }
-        )
-        if created:
-            tutor_user.set_password('tutor123')
-            tutor_user.save()
-            TutorProfile.objects.create(
-                user=tutor_user,
-                employee_id='TUT000001',
-                hire_date='2024-01-01',
-                department='Computer Science',
-                specialization='Web Development, Python, Django',
-                bio='Experienced software developer and educator',
-                hourly_rate=50.00
-            )
-            self.stdout.write(
-                self.style.SUCCESS(f'Created tutor user: {tutor_user.email}')
-            )
+        with transaction.atomic():
+            existing = set(User.objects.filter(email__in=emails).values_list('email', flat=True))
+            new_specs = [spec for spec in SAMPLE_USERS if spec['fields']['email'] not in existing]
 
-        # Create sample student
-        student_user, created = User.objects.get_or_create(
-            email='student@lms.com',
-            defaults={
-                'username': 'student',
-                'first_name': 'Jane',
-                'last_name': 'Doe',
-                'role': 'student',
-                'is_verified': True,
-            }
-        )
-        if created:
-            student_user.set_password('student123')
-            student_user.save()
-            StudentProfile.objects.create(
-                user=student_user,
-                student_id='STU000001',
-                enrollment_date='2024-01-01',
-                current_level='Beginner',
-                gpa=3.5,
-                emergency_contact='John Doe',
-                emergency_phone='+1234567890'
-            )
-            self.stdout.write(
-                self.style.SUCCESS(f'Created student user: {student_user.email}')
+            # Passwords are hashed up front so the rows can be inserted in one batch
+            User.objects.bulk_create(
+                [User(password=make_password(spec['password']), **spec['fields']) for spec in new_specs],
+                ignore_conflicts=True,
             )
+            users = User.objects.filter(
+                email__in=[spec['fields']['email'] for spec in new_specs]
+            ).in_bulk(field_name='email')
+
+            profiles = {}
+            for spec in new_specs:
+                user = users.get(spec['fields']['email'])
+                if user is None:
+                    continue
+                profiles.setdefault(spec['profile_model'], []).append(
+                    spec['profile_model'](user=user, **spec['profile'])
+                )
+            for profile_model, rows in profiles.items():
+                profile_model.objects.bulk_create(rows)
+
+        for spec in new_specs:
+            if spec['fields']['email'] in users:
+                self.stdout.write(
+                    self.style.SUCCESS(f"Created {spec['label']} user: {spec['fields']['email']}")
+                )
 
         self.stdout.write(
             self.style.SUCCESS('Sample users created successfully!')
@@ -97,4 +116,4 @@ class Command(BaseCommand):
         self.stdout.write('Login credentials:')
         self.stdout.write('Admin: admin@lms.com / admin123')
         self.stdout.write('Tutor: tutor@lms.com / tutor123')
-        self.stdout.write('Student: student@lms.com / student123')
\ No newline at end of file
+        self.stdout.write('Student: student@lms.com / student123')
@@ -0,0 +1,30 @@
+"""
+Delete email verification OTPs that expired more than a few days ago.
+
+Used and expired codes are never read again, but they stay in the table and
+its lookup index. Schedule this daily (cron / PythonAnywhere scheduled task):
+
+    python manage.py prune_otps             # older than 7 days
+    python manage.py prune_otps --days 1
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from authentication.models import EmailVerificationOTP
+
+
+class Command(BaseCommand):
+    help = 'Delete email verification OTPs that expired more than N days ago.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=7,
+                            help='Keep OTPs that expired within this many days (default 7).')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        # Nothing references OTP rows, so this is a single DELETE statement
+        deleted, _ = EmailVerificationOTP.objects.filter(expires_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} expired OTPs'))
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0003_add_management_role'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='emailverificationotp',
+            index=models.Index(fields=['user', 'email', 'is_used', '-created_at'], name='otp_lookup_idx'),
+        ),
+    ]
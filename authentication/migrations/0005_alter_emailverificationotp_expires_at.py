@@ -0,0 +1,17 @@
+import authentication.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0004_emailverificationotp_otp_lookup_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='emailverificationotp',
+            name='expires_at',
+            field=models.DateTimeField(default=authentication.models._otp_expiry),
+        ),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations, models
+
+
+def create_nonstudent_role_index(apps, schema_editor):
+    # Partial indexes are PostgreSQL-only; other backends rely on the plain role index
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS users_role_nonstudent ON users (role) WHERE role <> 'student'"
+    )
+
+
+def drop_nonstudent_role_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS users_role_nonstudent')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0006_user_search_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='role',
+            field=models.CharField(choices=[('student', 'Student'), ('tutor', 'Tutor'), ('admin', 'Admin'), ('management', 'Management')], db_index=True, default='student', max_length=15),
+        ),
+        migrations.RunPython(create_nonstudent_role_index, drop_nonstudent_role_index),
+    ]
@@ -1,9 +1,10 @@
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.functions import Lower
 from django.utils import timezone
 from datetime import timedelta
-import random
-import string
+import secrets
 
 
 class User(AbstractUser):
@@ -18,7 +19,7 @@ class User(AbstractUser):
     ]
 
     email = models.EmailField(unique=True)
-    role = models.CharField(max_length=15, choices=ROLE_CHOICES, default='student')
+    role = models.CharField(max_length=15, choices=ROLE_CHOICES, default='student', db_index=True)
     phone_number = models.CharField(max_length=15, blank=True, null=True)
     profile_picture = models.ImageField(upload_to='profile_pictures/', blank=True, null=True)
     date_of_birth = models.DateField(blank=True, null=True)
@@ -33,6 +34,9 @@ class User(AbstractUser):
         db_table = 'users'
         verbose_name = 'User'
         verbose_name_plural = 'Users'
+        constraints = [
+            models.UniqueConstraint(Lower('email'), name='users_email_lower_uq'),
+        ]
     
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.role})"
@@ -116,6 +120,10 @@ class AdminProfile(models.Model):
         return f"Admin Profile: {self.user.full_name}"
 
 
+def _otp_expiry():
+    return timezone.now() + timedelta(minutes=10)  # OTP expires in 10 minutes
+
+
 class EmailVerificationOTP(models.Model):
     """
     Model for storing email verification OTPs
@@ -124,7 +132,7 @@ class EmailVerificationOTP(models.Model):
     email = models.EmailField()
     otp_code = models.CharField(max_length=6)
     created_at = models.DateTimeField(auto_now_add=True)
-    expires_at = models.DateTimeField()
+    expires_at = models.DateTimeField(default=_otp_expiry)
     is_used = models.BooleanField(default=False)
     attempts = models.PositiveIntegerField(default=0)
     
@@ -133,32 +141,31 @@ class EmailVerificationOTP(models.Model):
         verbose_name = 'Email Verification OTP'
         verbose_name_plural = 'Email Verification OTPs'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'email', 'is_used', '-created_at'], name='otp_lookup_idx'),
+        ]
     
     def __str__(self):
         return f"OTP for {self.email} - {self.otp_code}"
     
-    def save(self, *args, **kwargs):
-        if not self.pk:  # Only set expiry on creation
-            self.expires_at = timezone.now() + timedelta(minutes=10)  # OTP expires in 10 minutes
-        super().save(*args, **kwargs)
-    
     @classmethod
     def generate_otp(cls, user, email):
         """
         Generate a new OTP for email verification
         """
-        # Invalidate any existing OTPs for this user/email
-        cls.objects.filter(user=user, email=email, is_used=False).update(is_used=True)
-        
         # Generate 6-digit OTP
-        otp_code = ''.join(random.choices(string.digits, k=6))
+        otp_code = f"{secrets.randbelow(1_000_000):06d}"
         
-        # Create new OTP
-        otp = cls.objects.create(
-            user=user,
-            email=email,
-            otp_code=otp_code
-        )
+        with transaction.atomic():
+            # Invalidate any existing OTPs for this user/email
+            cls.objects.filter(user=user, email=email, is_used=False).update(is_used=True)
+            
+            # Create new OTP
+            otp = cls.objects.create(
+                user=user,
+                email=email,
+                otp_code=otp_code
+            )
         
         return otp
     
@@ -176,17 +183,18 @@ class EmailVerificationOTP(models.Model):
             return False
         
         if self.otp_code != provided_otp:
+            # Increment in SQL so concurrent wrong guesses are all counted
+            type(self).objects.filter(pk=self.pk).update(attempts=F('attempts') + 1)
             self.attempts += 1
-            self.save()
             return False
         
         # Mark as used
         self.is_used = True
-        self.save()
+        self.save(update_fields=['is_used'])
         
         # Verify user's email
+        User.objects.filter(pk=self.user_id).update(is_verified=True)
         self.user.is_verified = True
-        self.user.save()
         
         return True
     
@@ -1,9 +1,43 @@
 from rest_framework import serializers
-from django.contrib.auth import authenticate
 from django.contrib.auth.password_validation import validate_password
 from .models import User, StudentProfile, TutorProfile, AdminProfile, EmailVerificationOTP
 
 
+# role -> reverse one-to-one accessor of that role's profile
+PROFILE_ATTRS = {
+    'student': 'student_profile',
+    'tutor': 'tutor_profile',
+    'admin': 'admin_profile',
+}
+
+
+# Unbound fields, so the payload formats dates exactly as UserSerializer does
+_date_field = serializers.DateField()
+_datetime_field = serializers.DateTimeField()
+
+
+def _user_payload(user):
+    """
+    Plain-dict equivalent of UserSerializer(user).data (no request in context)
+    for single-user responses
+    """
+    return {
+        'id': user.id,
+        'username': user.username,
+        'email': user.email,
+        'first_name': user.first_name,
+        'last_name': user.last_name,
+        'full_name': user.full_name,
+        'role': user.role,
+        'phone_number': user.phone_number,
+        'profile_picture': user.profile_picture.url if user.profile_picture else None,
+        'date_of_birth': _date_field.to_representation(user.date_of_birth) if user.date_of_birth else None,
+        'is_verified': user.is_verified,
+        'created_at': _datetime_field.to_representation(user.created_at),
+        'updated_at': _datetime_field.to_representation(user.updated_at),
+    }
+
+
 class UserRegistrationSerializer(serializers.ModelSerializer):
     """
     Serializer for user registration
@@ -14,6 +48,14 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ('username', 'email', 'password', 'password_confirm', 'first_name', 'last_name', 'role', 'phone_number')
+        # Case-insensitive uniqueness is checked in validate_email instead
+        extra_kwargs = {'email': {'validators': []}}
+    
+    def validate_email(self, value):
+        value = value.lower()
+        if User.objects.filter(email__iexact=value).exists():
+            raise serializers.ValidationError('A user with this email already exists.')
+        return value
     
     def validate(self, attrs):
         if attrs['password'] != attrs['password_confirm']:
@@ -38,8 +80,13 @@ class UserLoginSerializer(serializers.Serializer):
         password = attrs.get('password')
         
         if email and password:
-            user = authenticate(username=email, password=password)
-            if not user:
+            # Single backend: one lookup and one hash check instead of authenticate()
+            user = User.objects.filter(email__iexact=email).first()
+            if user is None:
+                # Hash anyway so unknown emails take as long as wrong passwords
+                User().set_password(password)
+                raise serializers.ValidationError('Invalid credentials')
+            if not user.check_password(password):
                 raise serializers.ValidationError('Invalid credentials')
             if not user.is_active:
                 raise serializers.ValidationError('User account is disabled')
@@ -96,13 +143,21 @@ class AdminProfileSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
+PROFILE_SERIALIZERS = {
+    'student': StudentProfileSerializer,
+    'tutor': TutorProfileSerializer,
+    'admin': AdminProfileSerializer,
+}
+
+
 class UserProfileSerializer(serializers.ModelSerializer):
     """
     Comprehensive user profile serializer
     """
-    student_profile = StudentProfileSerializer(read_only=True)
-    tutor_profile = TutorProfileSerializer(read_only=True)
-    admin_profile = AdminProfileSerializer(read_only=True)
+    # Only the profile matching the user's role is looked up; the other two render as None
+    student_profile = serializers.SerializerMethodField()
+    tutor_profile = serializers.SerializerMethodField()
+    admin_profile = serializers.SerializerMethodField()
     
     class Meta:
         model = User
@@ -110,6 +165,23 @@ class UserProfileSerializer(serializers.ModelSerializer):
                  'phone_number', 'profile_picture', 'date_of_birth', 'is_verified', 
                  'created_at', 'updated_at', 'student_profile', 'tutor_profile', 'admin_profile')
         read_only_fields = ('id', 'created_at', 'updated_at')
+    
+    def _role_profile(self, user, role):
+        if user.role != role:
+            return None
+        profile = getattr(user, PROFILE_ATTRS[role], None)
+        if profile is None:
+            return None
+        return PROFILE_SERIALIZERS[role](profile, context=self.context).data
+    
+    def get_student_profile(self, obj):
+        return self._role_profile(obj, 'student')
+    
+    def get_tutor_profile(self, obj):
+        return self._role_profile(obj, 'tutor')
+    
+    def get_admin_profile(self, obj):
+        return self._role_profile(obj, 'admin')
 
 
 class ChangePasswordSerializer(serializers.Serializer):
@@ -0,0 +1,164 @@
+from django.core import mail
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from .models import User, StudentProfile, EmailVerificationOTP
+
+
+PASSWORD = 'correct-horse-battery-staple'
+
+
+class AuthTestCase(TestCase):
+
+    def setUp(self):
+        # Throttle counters live in the cache
+        cache.clear()
+        self.client = APIClient()
+
+    def create_student(self, email='ada@example.com', is_verified=True):
+        user = User.objects.create_user(
+            username=email.split('@')[0], email=email, password=PASSWORD,
+            first_name='Ada', last_name='Lovelace', role='student', is_verified=is_verified,
+        )
+        StudentProfile.objects.create(
+            user=user, student_id=f'STU{user.id:06d}', enrollment_date=user.created_at.date(), gpa='3.50',
+        )
+        return user
+
+
+class RegisterTests(AuthTestCase):
+
+    def test_register_creates_user_profile_and_otp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('register'), {
+                'username': 'grace',
+                'email': 'Grace@Example.com',
+                'password': PASSWORD,
+                'password_confirm': PASSWORD,
+                'first_name': 'Grace',
+                'last_name': 'Hopper',
+                'role': 'student',
+            }, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['user']['email'], 'grace@example.com')
+        user = User.objects.get(email='grace@example.com')
+        self.assertEqual(user.student_profile.student_id, f'STU{user.id:06d}')
+        self.assertTrue(EmailVerificationOTP.objects.filter(user=user, is_used=False).exists())
+        # The OTP email goes out once the account is committed
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['grace@example.com'])
+
+    def test_register_rejects_email_differing_only_in_case(self):
+        self.create_student(email='ada@example.com')
+        response = self.client.post(reverse('register'), {
+            'username': 'ada2',
+            'email': 'ADA@example.com',
+            'password': PASSWORD,
+            'password_confirm': PASSWORD,
+            'first_name': 'Ada',
+            'last_name': 'Byron',
+            'role': 'student',
+        }, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('email', response.data)
+
+
+class VerifyEmailOTPTests(AuthTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_student(is_verified=False)
+        self.otp = EmailVerificationOTP.generate_otp(self.user, self.user.email)
+
+    def test_verify_matches_email_case_insensitively(self):
+        # OTP and user in one SELECT, mark the OTP used, mark the user verified
+        with self.assertNumQueries(3):
+            response = self.client.post(reverse('verify_email_otp'), {
+                'email': 'ADA@Example.com',
+                'otp_code': self.otp.otp_code,
+            }, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('access', response.data['tokens'])
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.is_verified)
+
+    def test_wrong_code_counts_an_attempt(self):
+        wrong_code = '000000' if self.otp.otp_code != '000000' else '111111'
+        response = self.client.post(reverse('verify_email_otp'), {
+            'email': self.user.email,
+            'otp_code': wrong_code,
+        }, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['attempts_remaining'], 1)
+        self.otp.refresh_from_db()
+        self.assertEqual(self.otp.attempts, 1)
+
+
+class LoginTests(AuthTestCase):
+
+    def test_login_matches_email_case_insensitively(self):
+        self.create_student()
+        response = self.client.post(reverse('login'), {
+            'email': 'ADA@example.com',
+            'password': PASSWORD,
+        }, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['user']['email'], 'ada@example.com')
+        self.assertIn('refresh', response.data['tokens'])
+
+    def test_login_rejects_wrong_password_and_unknown_email_alike(self):
+        self.create_student()
+        wrong_password = self.client.post(reverse('login'), {
+            'email': 'ada@example.com', 'password': 'not-the-password',
+        }, format='json')
+        unknown_email = self.client.post(reverse('login'), {
+            'email': 'nobody@example.com', 'password': PASSWORD,
+        }, format='json')
+
+        self.assertEqual(wrong_password.status_code, 400)
+        self.assertEqual(wrong_password.data, unknown_email.data)
+
+    def test_login_requires_verified_email(self):
+        self.create_student(is_verified=False)
+        response = self.client.post(reverse('login'), {
+            'email': 'ada@example.com',
+            'password': PASSWORD,
+        }, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(response.data['verification_required'])
+
+
+class UserProfileViewTests(AuthTestCase):
+
+    def test_profile_loads_user_and_role_profile_in_one_query(self):
+        user = self.create_student()
+        self.client.force_authenticate(user)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('user_profile'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.data['tutor_profile'])
+        self.assertIsNone(response.data['admin_profile'])
+        student_profile = response.data['student_profile']
+        # Same shape as the nested profile serializers: Decimal as a string, user nested
+        self.assertEqual(student_profile['gpa'], '3.50')
+        self.assertEqual(student_profile['user']['email'], 'ada@example.com')
+
+
+class RoleBasedUsersViewTests(AuthTestCase):
+
+    def test_non_admin_gets_the_access_denied_error(self):
+        self.client.force_authenticate(self.create_student())
+        response = self.client.get(reverse('role_based_users'))
+
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.data, {'error': 'Access denied'})
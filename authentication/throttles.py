@@ -1,4 +1,6 @@
-from rest_framework.throttling import AnonRateThrottle
+import hashlib
+
+from rest_framework.throttling import AnonRateThrottle, SimpleRateThrottle
 
 
 class LoginRateThrottle(AnonRateThrottle):
@@ -15,3 +17,17 @@ class OTPVerifyRateThrottle(AnonRateThrottle):
 
 class OTPResendRateThrottle(AnonRateThrottle):
     scope = 'otp_resend'
+
+
+class OTPPerAccountRateThrottle(SimpleRateThrottle):
+    """Per-email throttle for OTP endpoints — holds even when the caller rotates IPs."""
+    scope = 'otp_per_account'
+
+    def get_cache_key(self, request, view):
+        email = request.data.get('email')
+        if not isinstance(email, str) or not email:
+            return None  # Nothing to key on; the IP throttle still applies
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': hashlib.sha256(email.strip().lower().encode()).hexdigest(),
+        }
@@ -19,5 +19,5 @@ urlpatterns = [
     path('change-password/', views.change_password_view, name='change_password'),
     
     # Admin endpoints
-    path('users/', views.role_based_users_view, name='role_based_users'),
+    path('users/', views.RoleBasedUsersView.as_view(), name='role_based_users'),
 ]
\ No newline at end of file
@@ -1,4 +1,6 @@
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from django.conf import settings
 from django.core.mail import EmailMultiAlternatives
@@ -8,6 +10,22 @@ logger = logging.getLogger(__name__)
 
 OTP_EXPIRY_MINUTES = 10
 
+# Plain-text fallback, built once; only the name and code vary per email
+OTP_REGISTER_INTRO = 'Thanks for signing up. Use the code below to verify your email address.'
+OTP_RESEND_INTRO = "Here's your new verification code for your Algaddaf Technology Hub account."
+OTP_TEXT_TEMPLATE = (
+    "Hi{greeting_name},\n\n"
+    "{intro}\n\n"
+    "Verification code: {otp_code}\n\n"
+    "This code expires in {expiry_minutes} minutes. Please don't share it.\n\n"
+    "If you didn't request this, you can ignore this email.\n\n"
+    "Algaddaf Technology Hub"
+)
+
+# Only created when OTP_EMAIL_ASYNC is on; see dispatch_otp_email
+_email_executor = None
+_email_executor_lock = threading.Lock()
+
 
 def send_otp_email(email, otp_code, first_name='', is_resend=False):
     """
@@ -27,18 +45,11 @@ def send_otp_email(email, otp_code, first_name='', is_resend=False):
         'expiry_minutes': OTP_EXPIRY_MINUTES,
     }
 
-    intro = (
-        "Here's your new verification code for your Algaddaf Technology Hub account."
-        if is_resend else
-        'Thanks for signing up. Use the code below to verify your email address.'
-    )
-    text_body = (
-        f"Hi{(' ' + first_name) if first_name else ''},\n\n"
-        f"{intro}\n\n"
-        f"Verification code: {otp_code}\n\n"
-        f"This code expires in {OTP_EXPIRY_MINUTES} minutes. Please don't share it.\n\n"
-        "If you didn't request this, you can ignore this email.\n\n"
-        "Algaddaf Technology Hub"
+    text_body = OTP_TEXT_TEMPLATE.format(
+        greeting_name=f' {first_name}' if first_name else '',
+        intro=OTP_RESEND_INTRO if is_resend else OTP_REGISTER_INTRO,
+        otp_code=otp_code,
+        expiry_minutes=OTP_EXPIRY_MINUTES,
     )
 
     try:
@@ -55,3 +66,21 @@ def send_otp_email(email, otp_code, first_name='', is_resend=False):
     except Exception:
         logger.exception('Failed to send OTP email to %s', email)
         return False
+
+
+def dispatch_otp_email(email, otp_code, first_name='', is_resend=False):
+    """
+    Send the OTP email. Synchronous by default; with settings.OTP_EMAIL_ASYNC
+    the send is queued on a background thread instead, which only suits servers
+    that run long-lived, thread-enabled workers (not PythonAnywhere's uWSGI).
+    Failures are logged by send_otp_email itself.
+    """
+    global _email_executor
+    if not settings.OTP_EMAIL_ASYNC:
+        send_otp_email(email, otp_code, first_name, is_resend)
+        return
+    if _email_executor is None:
+        with _email_executor_lock:
+            if _email_executor is None:
+                _email_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='otp-email')
+    _email_executor.submit(send_otp_email, email, otp_code, first_name, is_resend)
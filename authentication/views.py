@@ -1,19 +1,67 @@
+import json
+import logging
+
 from rest_framework import status, generics, permissions
 from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.response import Response
-from .throttles import LoginRateThrottle, RegisterRateThrottle, OTPVerifyRateThrottle, OTPResendRateThrottle
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.utils.encoders import JSONEncoder
+from .throttles import (
+    LoginRateThrottle, RegisterRateThrottle, OTPVerifyRateThrottle, OTPResendRateThrottle,
+    OTPPerAccountRateThrottle
+)
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import login
+from django.core.cache import cache
+from django.http import StreamingHttpResponse
+from django.db import transaction
 from django.utils import timezone
 from django.conf import settings
 from .models import User, StudentProfile, TutorProfile, AdminProfile, EmailVerificationOTP
-from .utils import send_otp_email
+from .utils import dispatch_otp_email
 from .serializers import (
     UserRegistrationSerializer, UserLoginSerializer, UserSerializer,
     UserProfileSerializer, ChangePasswordSerializer, OTPVerificationSerializer,
-    ResendOTPSerializer
+    ResendOTPSerializer, PROFILE_ATTRS, _user_payload
 )
 
+logger = logging.getLogger(__name__)
+
+
+# role -> (profile model, id prefix, id field, start-date field)
+ROLE_PROFILES = {
+    'student': (StudentProfile, 'STU', 'student_id', 'enrollment_date'),
+    'tutor': (TutorProfile, 'TUT', 'employee_id', 'hire_date'),
+    'admin': (AdminProfile, 'ADM', 'employee_id', 'hire_date'),
+}
+
+
+USER_DATA_CACHE_SECONDS = 300
+
+
+def _cached_user_data(user):
+    """
+    UserSerializer(user).data, cached until the user row changes.
+    is_verified is part of the key because verification updates it without bumping updated_at.
+    """
+    key = f'user_data:{user.pk}:{user.updated_at.timestamp()}:{int(user.is_verified)}'
+    data = cache.get(key)
+    if data is None:
+        data = UserSerializer(user).data
+        cache.set(key, data, USER_DATA_CACHE_SECONDS)
+    return data
+
+
+def _tokens_for(user):
+    """
+    Issue a refresh/access JWT pair for the user, serializing each token once
+    """
+    refresh = RefreshToken.for_user(user)
+    return {
+        'refresh': str(refresh),
+        'access': str(refresh.access_token),
+    }
+
 
 class RegisterView(generics.CreateAPIView):
     """
@@ -27,37 +75,32 @@ class RegisterView(generics.CreateAPIView):
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        user = serializer.save()
-        
-        # Create role-specific profile
-        if user.role == 'student':
-            StudentProfile.objects.create(
-                user=user,
-                student_id=f"STU{user.id:06d}",
-                enrollment_date=user.created_at.date()
-            )
-        elif user.role == 'tutor':
-            TutorProfile.objects.create(
-                user=user,
-                employee_id=f"TUT{user.id:06d}",
-                hire_date=user.created_at.date()
+        with transaction.atomic():
+            user = serializer.save()
+            
+            # Create role-specific profile
+            profile = ROLE_PROFILES.get(user.role)
+            if profile:
+                model, prefix, id_field, date_field = profile
+                model.objects.create(**{
+                    'user': user,
+                    id_field: f"{prefix}{user.id:06d}",
+                    date_field: user.created_at.date(),
+                })
+            
+            # Generate OTP for email verification
+            otp = EmailVerificationOTP.generate_otp(user, user.email)
+            if settings.DEBUG:
+                logger.debug('OTP %s issued for %s expires=%s', otp.otp_code, user.email, otp.expires_at)
+            
+            # Send OTP via email once the account is committed
+            transaction.on_commit(
+                lambda: dispatch_otp_email(user.email, otp.otp_code, first_name=user.first_name)
             )
-        elif user.role == 'admin':
-            AdminProfile.objects.create(
-                user=user,
-                employee_id=f"ADM{user.id:06d}",
-                hire_date=user.created_at.date()
-            )
-        
-        # Generate OTP for email verification
-        otp = EmailVerificationOTP.generate_otp(user, user.email)
-        
-        # Send OTP via email
-        send_otp_email(user.email, otp.otp_code, first_name=user.first_name)
         
         return Response({
             'message': 'User registered successfully. Please verify your email.',
-            'user': UserSerializer(user).data,
+            'user': _user_payload(user),
             'email_verification_required': True,
             'email': user.email
         }, status=status.HTTP_201_CREATED)
@@ -86,16 +129,10 @@ def login_view(request):
     
     login(request, user)
     
-    # Generate JWT tokens
-    refresh = RefreshToken.for_user(user)
-    
     return Response({
         'message': 'Login successful',
-        'user': UserSerializer(user).data,
-        'tokens': {
-            'refresh': str(refresh),
-            'access': str(refresh.access_token),
-        }
+        'user': _user_payload(user),
+        'tokens': _tokens_for(user),
     }, status=status.HTTP_200_OK)
 
 
@@ -122,7 +159,12 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get_object(self):
-        return self.request.user
+        # Only the profile matching the user's role is rendered, so only JOIN that one
+        queryset = User.objects.all()
+        profile_attr = PROFILE_ATTRS.get(self.request.user.role)
+        if profile_attr:
+            queryset = queryset.select_related(profile_attr)
+        return queryset.get(pk=self.request.user.pk)
 
 
 @api_view(['GET'])
@@ -131,8 +173,7 @@ def user_info_view(request):
     """
     Get current user information
     """
-    serializer = UserSerializer(request.user)
-    return Response(serializer.data)
+    return Response(_cached_user_data(request.user))
 
 
 @api_view(['POST'])
@@ -151,28 +192,68 @@ def change_password_view(request):
     return Response({'message': 'Password changed successfully'}, status=status.HTTP_200_OK)
 
 
-@api_view(['GET'])
-@permission_classes([permissions.IsAuthenticated])
-def role_based_users_view(request):
+class UserListPagination(PageNumberPagination):
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+
+# Fields of each user-list row; profile_picture is left out so rows need no storage lookups
+USER_LIST_FIELDS = (
+    'id', 'username', 'email', 'first_name', 'last_name', 'role',
+    'phone_number', 'date_of_birth', 'is_verified', 'created_at', 'updated_at',
+)
+
+
+def _user_row(row):
+    """
+    Add full_name to a User.values() row
+    """
+    row['full_name'] = f"{row['first_name']} {row['last_name']}".strip()
+    return row
+
+
+class RoleBasedUsersView(generics.ListAPIView):
     """
     Get users based on role (admin only)
     """
-    if not request.user.is_admin():
-        return Response({'error': 'Access denied'}, status=status.HTTP_403_FORBIDDEN)
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = UserListPagination
     
-    role = request.GET.get('role')
-    if role:
-        users = User.objects.filter(role=role)
-    else:
-        users = User.objects.all()
+    def get_queryset(self):
+        # Plain dicts straight from the DB, no serializer pass
+        queryset = User.objects.values(*USER_LIST_FIELDS)
+        role = self.request.query_params.get('role')
+        if role:
+            queryset = queryset.filter(role=role)
+        return queryset.order_by('id')
     
-    serializer = UserSerializer(users, many=True)
-    return Response(serializer.data)
+    def list(self, request, *args, **kwargs):
+        if not request.user.is_admin():
+            return Response({'error': 'Access denied'}, status=status.HTTP_403_FORBIDDEN)
+        
+        queryset = self.get_queryset()
+        
+        # ?export=1 streams every matching user instead of a single page
+        if request.query_params.get('export'):
+            def stream():
+                yield '['
+                for index, row in enumerate(queryset.iterator(chunk_size=2000)):
+                    if index:
+                        yield ','
+                    # DRF's encoder, as the paginated response uses, so both emit identical values
+                    yield json.dumps(_user_row(row), cls=JSONEncoder)
+                yield ']'
+            
+            return StreamingHttpResponse(stream(), content_type='application/json')
+        
+        page = self.paginate_queryset(queryset)
+        return self.get_paginated_response([_user_row(row) for row in page])
 
 
 @api_view(['POST'])
 @permission_classes([permissions.AllowAny])
-@throttle_classes([OTPVerifyRateThrottle])
+@throttle_classes([OTPVerifyRateThrottle, OTPPerAccountRateThrottle])
 def verify_email_otp(request):
     """
     Verify email OTP
@@ -183,18 +264,14 @@ def verify_email_otp(request):
     email = serializer.validated_data['email']
     otp_code = serializer.validated_data['otp_code']
     
-    try:
-        user = User.objects.get(email=email)
-    except User.DoesNotExist:
-        return Response({
-            'error': 'User not found'
-        }, status=status.HTTP_404_NOT_FOUND)
-    
-    # Get the most recent valid OTP
-    otp = EmailVerificationOTP.objects.filter(
-        user=user, 
-        email=email, 
+    # Get the most recent valid OTP together with its user
+    # Emails are matched case-insensitively, as at login
+    otp = EmailVerificationOTP.objects.select_related('user').filter(
+        user__email__iexact=email,
+        email__iexact=email,
         is_used=False
+    ).only(
+        'id', 'otp_code', 'expires_at', 'attempts', 'is_used', 'user'
     ).order_by('-created_at').first()
     
     if not otp:
@@ -202,6 +279,8 @@ def verify_email_otp(request):
             'error': 'No valid OTP found. Please request a new one.'
         }, status=status.HTTP_400_BAD_REQUEST)
     
+    user = otp.user
+    
     if otp.is_expired():
         return Response({
             'error': 'OTP has expired. Please request a new one.'
@@ -214,15 +293,10 @@ def verify_email_otp(request):
     
     if otp.verify(otp_code):
         # Generate JWT tokens after successful verification
-        refresh = RefreshToken.for_user(user)
-        
         return Response({
             'message': 'Email verified successfully!',
-            'user': UserSerializer(user).data,
-            'tokens': {
-                'refresh': str(refresh),
-                'access': str(refresh.access_token),
-            }
+            'user': _user_payload(user),
+            'tokens': _tokens_for(user),
         }, status=status.HTTP_200_OK)
     else:
         return Response({
@@ -233,7 +307,7 @@ def verify_email_otp(request):
 
 @api_view(['POST'])
 @permission_classes([permissions.AllowAny])
-@throttle_classes([OTPResendRateThrottle])
+@throttle_classes([OTPResendRateThrottle, OTPPerAccountRateThrottle])
 def resend_otp(request):
     """
     Resend OTP for email verification
@@ -244,7 +318,7 @@ def resend_otp(request):
     email = serializer.validated_data['email']
     
     try:
-        user = User.objects.get(email=email)
+        user = User.objects.only('id', 'email', 'is_verified', 'first_name').get(email__iexact=email)
     except User.DoesNotExist:
         # Return the same success response to prevent email enumeration
         return Response({
@@ -258,11 +332,13 @@ def resend_otp(request):
             'email': email
         }, status=status.HTTP_200_OK)
     
-    # Generate new OTP
-    otp = EmailVerificationOTP.generate_otp(user, email)
+    # Generate new OTP for the address as stored, whatever casing the client sent
+    otp = EmailVerificationOTP.generate_otp(user, user.email)
+    if settings.DEBUG:
+        logger.debug('OTP %s issued for %s expires=%s', otp.otp_code, user.email, otp.expires_at)
     
     # Send OTP via email
-    send_otp_email(email, otp.otp_code, first_name=user.first_name, is_resend=True)
+    dispatch_otp_email(user.email, otp.otp_code, first_name=user.first_name, is_resend=True)
     
     return Response({
         'message': 'OTP sent successfully',
@@ -1,8 +1,33 @@
 from django.contrib import admin
+from django.db.models import Count
+from django.utils import timezone
 from django.utils.html import format_html
+from .caching import PAGE_COUNT_VERSION_KEY, PUBLIC_VERSION_KEY, bump_cache_version
 from .models import Category, Tag, Post, Comment, PostView
 
 
+STATUS_UPDATE_CHUNK_SIZE = 1000
+
+
+def _status_action(status, description, verb):
+    """Build an admin action that sets status on the selected posts in bounded batches"""
+    def action(modeladmin, request, queryset):
+        extra = {'published_at': timezone.now()} if status == 'published' else {}
+        pks = list(queryset.values_list('pk', flat=True))
+        updated = 0
+        # Keep each UPDATE (and its row locks) to one chunk of posts
+        for start in range(0, len(pks), STATUS_UPDATE_CHUNK_SIZE):
+            chunk = pks[start:start + STATUS_UPDATE_CHUNK_SIZE]
+            updated += Post.objects.filter(pk__in=chunk).update(status=status, **extra)
+        # Queryset updates send no post_save, so invalidate the public caches here
+        if updated:
+            bump_cache_version(PUBLIC_VERSION_KEY)
+            bump_cache_version(PAGE_COUNT_VERSION_KEY)
+        modeladmin.message_user(request, f'{updated} posts {verb}.')
+    action.short_description = description
+    return action
+
+
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
     list_display = ['name', 'slug', 'post_count', 'created_at']
@@ -10,9 +35,13 @@ class CategoryAdmin(admin.ModelAdmin):
     search_fields = ['name', 'description']
     prepopulated_fields = {'slug': ('name',)}
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(posts_total=Count('posts'))
+    
     def post_count(self, obj):
-        return obj.posts.count()
+        return obj.posts_total
     post_count.short_description = 'Posts'
+    post_count.admin_order_field = 'posts_total'
 
 
 @admin.register(Tag)
@@ -22,9 +51,13 @@ class TagAdmin(admin.ModelAdmin):
     search_fields = ['name']
     prepopulated_fields = {'slug': ('name',)}
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(posts_total=Count('posts'))
+    
     def post_count(self, obj):
-        return obj.posts.count()
+        return obj.posts_total
     post_count.short_description = 'Posts'
+    post_count.admin_order_field = 'posts_total'
 
 
 @admin.register(Post)
@@ -63,21 +96,9 @@ class PostAdmin(admin.ModelAdmin):
             obj.author = request.user
         super().save_model(request, obj, form, change)
     
-    def make_published(self, request, queryset):
-        from django.utils import timezone
-        updated = queryset.update(status='published', published_at=timezone.now())
-        self.message_user(request, f'{updated} posts were successfully published.')
-    make_published.short_description = "Mark selected posts as published"
-    
-    def make_draft(self, request, queryset):
-        updated = queryset.update(status='draft')
-        self.message_user(request, f'{updated} posts were marked as draft.')
-    make_draft.short_description = "Mark selected posts as draft"
-    
-    def make_archived(self, request, queryset):
-        updated = queryset.update(status='archived')
-        self.message_user(request, f'{updated} posts were archived.')
-    make_archived.short_description = "Archive selected posts"
+    make_published = _status_action('published', 'Mark selected posts as published', 'were successfully published')
+    make_draft = _status_action('draft', 'Mark selected posts as draft', 'were marked as draft')
+    make_archived = _status_action('archived', 'Archive selected posts', 'were archived')
 
 
 @admin.register(Comment)
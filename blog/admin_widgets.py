@@ -1,10 +1,41 @@
 from django.contrib.admin.views.main import ChangeList
-from django.db.models import Count, Sum
+from django.core.cache import cache
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
 from django.utils.html import format_html
 from django.urls import reverse
 from .models import Post, Category, Tag, Comment
 
 
+BLOG_STATS_CACHE_KEY = 'blog_admin_stats'
+BLOG_STATS_CACHE_SECONDS = 60
+
+
+def _compute_blog_stats():
+    """Post and comment figures in one aggregate query each"""
+    post_stats = Post.objects.aggregate(
+        total_posts=Count('id'),
+        published_posts=Count('id', filter=Q(status='published')),
+        draft_posts=Count('id', filter=Q(status='draft')),
+        total_views=Coalesce(Sum('views'), 0),
+    )
+    comment_stats = Comment.objects.aggregate(
+        total_comments=Count('id'),
+        pending_comments=Count('id', filter=Q(is_approved=False)),
+    )
+    return {
+        **post_stats,
+        **comment_stats,
+        'categories': Category.objects.count(),
+        'tags': Tag.objects.count(),
+    }
+
+
+def get_blog_stats():
+    """Blog statistics for the admin dashboard, cached for a minute"""
+    return cache.get_or_set(BLOG_STATS_CACHE_KEY, _compute_blog_stats, BLOG_STATS_CACHE_SECONDS)
+
+
 class BlogStatsChangeList(ChangeList):
     """Custom ChangeList to add blog statistics to admin dashboard"""
     
@@ -12,31 +43,18 @@ class BlogStatsChangeList(ChangeList):
         context = super().get_context_data(**kwargs)
         
         # Add blog statistics
-        context['blog_stats'] = {
-            'total_posts': Post.objects.count(),
-            'published_posts': Post.objects.filter(status='published').count(),
-            'draft_posts': Post.objects.filter(status='draft').count(),
-            'total_views': Post.objects.aggregate(total_views=Sum('views'))['total_views'] or 0,
-            'total_comments': Comment.objects.count(),
-            'pending_comments': Comment.objects.filter(is_approved=False).count(),
-            'categories': Category.objects.count(),
-            'tags': Tag.objects.count(),
-        }
+        context['blog_stats'] = get_blog_stats()
         
         return context
 
 
 def blog_stats_widget(request):
     """Custom widget to display blog statistics in admin dashboard"""
-    from django.db.models import Sum
-    
+    blog_stats = get_blog_stats()
     stats = {
-        'total_posts': Post.objects.count(),
-        'published_posts': Post.objects.filter(status='published').count(),
-        'draft_posts': Post.objects.filter(status='draft').count(),
-        'total_views': Post.objects.aggregate(total_views=Sum('views'))['total_views'] or 0,
-        'total_comments': Comment.objects.count(),
-        'pending_comments': Comment.objects.filter(is_approved=False).count(),
+        key: blog_stats[key]
+        for key in ('total_posts', 'published_posts', 'draft_posts',
+                    'total_views', 'total_comments', 'pending_comments')
     }
     
     return format_html(
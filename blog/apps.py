@@ -5,5 +5,5 @@ class BlogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'blog'
 
-
-
+    def ready(self):
+        from . import signals  # noqa: F401
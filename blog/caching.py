@@ -0,0 +1,37 @@
+import hashlib
+
+from django.core.cache import cache
+
+
+# Bumped on writes so every key built from it goes stale at once
+PAGE_COUNT_VERSION_KEY = 'blog:pagecount:version'
+PUBLIC_VERSION_KEY = 'blog:public:version'
+
+PUBLIC_CACHE_SECONDS = 120
+
+
+def cache_version(key):
+    """Current value of a version counter, starting at 1"""
+    return cache.get_or_set(key, 1, None)
+
+
+def bump_cache_version(key):
+    """Invalidate everything keyed on this version counter"""
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 2, None)
+
+
+def cached_public_data(request, build):
+    """
+    Serialized response data for a public blog GET, cached per full path
+    until a post, category or tag changes
+    """
+    digest = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    key = f'blog:public:{cache_version(PUBLIC_VERSION_KEY)}:{digest}'
+    data = cache.get(key)
+    if data is None:
+        data = build()
+        cache.set(key, data, PUBLIC_CACHE_SECONDS)
+    return data
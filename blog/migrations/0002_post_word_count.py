@@ -0,0 +1,25 @@
+from django.db import migrations, models
+
+
+def backfill_word_count(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    posts = list(Post.objects.only('id', 'content'))
+    for post in posts:
+        post.word_count = len(post.content.split())
+    Post.objects.bulk_update(posts, ['word_count'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_word_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+from django.db import migrations
+
+
+FULLTEXT_INDEX = 'blog_post_search_ft'
+
+
+def create_fulltext_index(apps, schema_editor):
+    # InnoDB FULLTEXT backs PostListView search on MySQL; SQLite keeps LIKE scans
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    schema_editor.execute(
+        f'CREATE FULLTEXT INDEX {FULLTEXT_INDEX} ON blog_post (title, excerpt, content)'
+    )
+
+
+def drop_fulltext_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    schema_editor.execute(f'DROP INDEX {FULLTEXT_INDEX} ON blog_post')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0002_post_word_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import F
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from django.urls import reverse
@@ -63,11 +64,15 @@ class Post(models.Model):
     views = models.PositiveIntegerField(default=0)
     likes = models.PositiveIntegerField(default=0)
     
+    # Derived from content on save so list pages never re-split the body
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    
     class Meta:
         ordering = ['-published_at', '-created_at']
         indexes = [
             models.Index(fields=['status', 'published_at']),
             models.Index(fields=['category', 'status']),
+            models.Index(fields=['status', '-views'], name='post_status_views_idx'),
         ]
     
     def __str__(self):
@@ -76,18 +81,29 @@ class Post(models.Model):
     def save(self, *args, **kwargs):
         if self.status == 'published' and not self.published_at:
             self.published_at = timezone.now()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'content' in update_fields:
+            self.word_count = len(self.content.split())
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'word_count'}
         super().save(*args, **kwargs)
     
     def get_absolute_url(self):
         return reverse('blog:post_detail', kwargs={'slug': self.slug})
     
+    @property
+    def read_time(self):
+        # Estimate reading time (average 200 words per minute)
+        return f"{max(1, self.word_count // 200)} min read"
+    
     @property
     def is_published(self):
         return self.status == 'published' and self.published_at is not None
     
-    def increment_views(self):
-        self.views += 1
-        self.save(update_fields=['views'])
+    def increment_views(self, by=1):
+        # Atomic in SQL: no read-modify-write race and no save() signals
+        Post.objects.filter(pk=self.pk).update(views=F('views') + by)
+        self.views += by
 
 
 class PostView(models.Model):
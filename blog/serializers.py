@@ -14,6 +14,10 @@ class CategorySerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
     
     def get_post_count(self, obj):
+        # List views annotate post_count; fall back to a COUNT for plain instances
+        post_count = getattr(obj, 'post_count', None)
+        if post_count is not None:
+            return post_count
         return obj.posts.filter(status='published').count()
 
 
@@ -26,6 +30,10 @@ class TagSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
     
     def get_post_count(self, obj):
+        # List views annotate post_count; fall back to a COUNT for plain instances
+        post_count = getattr(obj, 'post_count', None)
+        if post_count is not None:
+            return post_count
         return obj.posts.filter(status='published').count()
 
 
@@ -40,7 +48,7 @@ class PostListSerializer(serializers.ModelSerializer):
     category = CategorySerializer(read_only=True)
     tags = TagSerializer(many=True, read_only=True)
     excerpt = serializers.SerializerMethodField()
-    read_time = serializers.SerializerMethodField()
+    read_time = serializers.ReadOnlyField()
     
     class Meta:
         model = Post
@@ -54,15 +62,12 @@ class PostListSerializer(serializers.ModelSerializer):
     def get_excerpt(self, obj):
         if obj.excerpt:
             return obj.excerpt
-        # Generate excerpt from content if no excerpt provided
-        content = obj.content[:200]
-        return content + "..." if len(obj.content) > 200 else content
-    
-    def get_read_time(self, obj):
-        # Estimate reading time (average 200 words per minute)
-        word_count = len(obj.content.split())
-        read_time = max(1, word_count // 200)
-        return f"{read_time} min read"
+        # Generate excerpt from content if no excerpt provided; list views
+        # annotate content_preview so the full body never leaves the DB
+        content = getattr(obj, 'content_preview', None)
+        if content is None:
+            content = obj.content
+        return content[:200] + "..." if len(content) > 200 else content
 
 
 class PostDetailSerializer(serializers.ModelSerializer):
@@ -70,7 +75,7 @@ class PostDetailSerializer(serializers.ModelSerializer):
     category = CategorySerializer(read_only=True)
     tags = TagSerializer(many=True, read_only=True)
     comments = serializers.SerializerMethodField()
-    read_time = serializers.SerializerMethodField()
+    read_time = serializers.ReadOnlyField()
     
     class Meta:
         model = Post
@@ -83,13 +88,11 @@ class PostDetailSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'views', 'likes', 'created_at', 'updated_at']
     
     def get_comments(self, obj):
-        approved_comments = obj.comments.filter(is_approved=True)
+        # Detail views prefetch approved comments; fall back to a query otherwise
+        approved_comments = getattr(obj, 'approved_comments', None)
+        if approved_comments is None:
+            approved_comments = obj.comments.filter(is_approved=True)
         return CommentSerializer(approved_comments, many=True).data
-    
-    def get_read_time(self, obj):
-        word_count = len(obj.content.split())
-        read_time = max(1, word_count // 200)
-        return f"{read_time} min read"
 
 
 class PostCreateUpdateSerializer(serializers.ModelSerializer):
@@ -0,0 +1,24 @@
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from .caching import PAGE_COUNT_VERSION_KEY, PUBLIC_VERSION_KEY, bump_cache_version
+from .models import Category, Tag, Post, Comment
+
+
+@receiver([post_save, post_delete], sender=Post)
+@receiver([post_save, post_delete], sender=Comment)
+def invalidate_page_counts(sender, **kwargs):
+    bump_cache_version(PAGE_COUNT_VERSION_KEY)
+
+
+@receiver([post_save, post_delete], sender=Post)
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=Tag)
+def invalidate_public_responses(sender, **kwargs):
+    bump_cache_version(PUBLIC_VERSION_KEY)
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def invalidate_on_tag_change(sender, action, **kwargs):
+    if action.startswith('post_'):
+        bump_cache_version(PAGE_COUNT_VERSION_KEY)
+        bump_cache_version(PUBLIC_VERSION_KEY)
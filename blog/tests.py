@@ -0,0 +1,118 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .models import Category, Tag, Post, Comment
+
+User = get_user_model()
+
+
+class BlogQueryCountTests(TestCase):
+    """
+    Pin the number of queries the public and admin blog views run,
+    so a regression back to per-row queries fails here
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(
+            username='author', email='author@example.com', password='pass-for-tests-only',
+            first_name='Ada', last_name='Author', is_staff=True,
+        )
+        categories = [
+            Category.objects.create(name='Python', slug='python'),
+            Category.objects.create(name='Web', slug='web'),
+        ]
+        tags = [
+            Tag.objects.create(name='Django', slug='django'),
+            Tag.objects.create(name='APIs', slug='apis'),
+        ]
+        published_at = timezone.now() - timedelta(days=1)
+        for index in range(6):
+            post = Post.objects.create(
+                title=f'Post {index}',
+                slug=f'post-{index}',
+                author=cls.author,
+                category=categories[index % 2],
+                content='word ' * 300,
+                status='published',
+                published_at=published_at,
+            )
+            post.tags.set(tags)
+            for comment_index in range(3):
+                Comment.objects.create(
+                    post=post,
+                    name=f'Reader {comment_index}',
+                    email=f'reader{comment_index}@example.com',
+                    content='Nice post',
+                    is_approved=comment_index != 0,
+                )
+        cls.post = post
+    
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+    
+    def test_post_list(self):
+        url = reverse('blog:post_list')
+        # COUNT, posts with author and category, tags, category post counts
+        with self.assertNumQueries(4):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 6)
+        
+        # The page count is cached until a post or comment changes; hold the
+        # clock so the minute-floored cutoff, and so the cache key, can't move
+        with mock.patch('django.utils.timezone.now', return_value=timezone.now()):
+            self.client.get(url)
+            with self.assertNumQueries(3):
+                self.client.get(url)
+    
+    def test_post_detail(self):
+        url = reverse('blog:post_detail', kwargs={'slug': self.post.slug})
+        # Post with author and category, tags, approved comments, category post count,
+        # the first-view PostView INSERT and the views UPDATE
+        with self.assertNumQueries(6):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['comments']), 2)
+        
+        # A repeat view from the same IP is deduped in the cache: no INSERT
+        with self.assertNumQueries(5):
+            self.client.get(url)
+    
+    def test_admin_comment_list(self):
+        self.client.force_authenticate(self.author)
+        # COUNT and one page of comments, no join to posts
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('blog:admin_comment_list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 18)
+    
+    def test_blog_stats(self):
+        url = reverse('blog:blog_stats')
+        # Totals, category counts, tag count, popular ids, recent ids,
+        # the hydrated posts and their tags, top categories
+        with self.assertNumQueries(8):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total_posts'], 6)
+        
+        # Served from the public response cache until blog content changes
+        with self.assertNumQueries(0):
+            self.client.get(url)
+    
+    def test_admin_blog_stats(self):
+        self.client.force_authenticate(self.author)
+        # Status counts, total views, approval counts, recent posts and their tags,
+        # popular posts and their tags, category post counts, pending comments
+        with self.assertNumQueries(9):
+            response = self.client.get(reverse('blog:admin_blog_stats'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['pending_comments_count'], 6)
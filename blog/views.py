@@ -1,12 +1,21 @@
+import hashlib
+import re
+
 from rest_framework import generics, status, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
-from django.db.models import Q, Count, Sum
+from django.db import connection
+from django.db.models import Q, Count, Sum, Prefetch
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Substr
 from django.shortcuts import get_object_or_404
+from django.core.cache import cache
 from django.utils import timezone
+from django.utils.functional import cached_property
 from django.core.paginator import Paginator
 from django.http import JsonResponse
+from .caching import PAGE_COUNT_VERSION_KEY, cache_version, cached_public_data
 from .models import Category, Tag, Post, Comment, PostView
 from .serializers import (
     CategorySerializer, TagSerializer, PostListSerializer, 
@@ -15,24 +24,106 @@ from .serializers import (
 )
 
 
+POST_VIEW_DEDUPE_SECONDS = 60 * 60 * 24
+
+# Characters with a meaning in MySQL boolean-mode full-text queries
+FULLTEXT_OPERATORS = re.compile(r'[-+<>()~*"@.]')
+# InnoDB skips words shorter than innodb_ft_min_token_size (3 by default)
+FULLTEXT_MIN_LENGTH = 3
+
+
 class BlogPagination(PageNumberPagination):
     page_size = 12
     page_size_query_param = 'page_size'
     max_page_size = 50
 
 
+class CachingPaginator(Paginator):
+    """Paginator that caches COUNT(*) per query until posts or comments change"""
+    count_cache_seconds = 300
+    
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is None:
+            return super().count
+        digest = hashlib.md5(str(query).encode()).hexdigest()
+        key = f'pagecount:{cache_version(PAGE_COUNT_VERSION_KEY)}:{digest}'
+        value = cache.get(key)
+        if value is None:
+            value = super().count
+            cache.set(key, value, self.count_cache_seconds)
+        return value
+
+
+class CachedBlogPagination(BlogPagination):
+    django_paginator_class = CachingPaginator
+
+
+def tags_with_counts_prefetch():
+    """Prefetch tags annotated with post_count so nested TagSerializers skip a COUNT each"""
+    return Prefetch(
+        'tags',
+        queryset=Tag.objects.annotate(post_count=Count('posts', filter=Q(posts__status='published')))
+    )
+
+
+def approved_comments_prefetch():
+    """Prefetch approved comments into post.approved_comments for PostDetailSerializer"""
+    return Prefetch(
+        'comments',
+        queryset=Comment.objects.filter(is_approved=True).only('id', 'post_id', 'name', 'email', 'content', 'created_at'),
+        to_attr='approved_comments',
+    )
+
+
+def attach_category_post_counts(posts):
+    """Set category.post_count for a page of posts with one grouped COUNT instead of one per post"""
+    category_ids = {post.category_id for post in posts}
+    if not category_ids:
+        return
+    counts = dict(
+        Post.objects.filter(status='published', category_id__in=category_ids)
+        .order_by().values_list('category_id').annotate(n=Count('id'))
+    )
+    for post in posts:
+        post.category.post_count = counts.get(post.category_id, 0)
+
+
+class CachedPublicListMixin:
+    """Serve an unpaginated public list from the blog response cache"""
+    
+    def list(self, request, *args, **kwargs):
+        return Response(cached_public_data(
+            request,
+            lambda: self.get_serializer(self.filter_queryset(self.get_queryset()), many=True).data
+        ))
+
+
+def post_list_columns(queryset):
+    """
+    Load only what PostListSerializer renders: the body is replaced by a
+    preview one character longer than the generated excerpt
+    """
+    return queryset.defer('content', 'meta_description').annotate(
+        content_preview=Substr('content', 1, 201)
+    )
+
+
 # Public Views (No Authentication Required)
 class PostListView(generics.ListAPIView):
     """Public view to list all published blog posts"""
     serializer_class = PostListSerializer
-    pagination_class = BlogPagination
+    pagination_class = CachedBlogPagination
     permission_classes = [permissions.AllowAny]
     
     def get_queryset(self):
-        queryset = Post.objects.filter(
+        # Cutoff floored to the minute so the SQL, and its cached count, stays stable
+        cutoff = timezone.now().replace(second=0, microsecond=0)
+        queryset = post_list_columns(Post.objects.filter(
             status='published',
-            published_at__lte=timezone.now()
-        ).select_related('author', 'category').prefetch_related('tags')
+            published_at__lte=cutoff
+        ).select_related('author', 'category').prefetch_related(tags_with_counts_prefetch()))
         
         # Filter by category
         category_slug = self.request.query_params.get('category')
@@ -46,6 +137,19 @@ class PostListView(generics.ListAPIView):
         
         # Search functionality
         search = self.request.query_params.get('search')
+        terms = FULLTEXT_OPERATORS.sub(' ', search or '').split()
+        if connection.vendor == 'mysql' and terms and all(len(t) >= FULLTEXT_MIN_LENGTH for t in terms):
+            # Served by the blog_post_search_ft FULLTEXT index; every word must prefix-match
+            matches = queryset.annotate(
+                relevance=RawSQL(
+                    'MATCH (blog_post.title, blog_post.excerpt, blog_post.content) '
+                    'AGAINST (%s IN BOOLEAN MODE)',
+                    (' '.join(f'+{t}*' for t in terms),)
+                )
+            ).filter(relevance__gt=0)
+            # Stopwords and mid-word matches never hit the index; fall back to a substring scan
+            if matches.exists():
+                return matches.order_by('-published_at')
         if search:
             queryset = queryset.filter(
                 Q(title__icontains=search) |
@@ -54,6 +158,17 @@ class PostListView(generics.ListAPIView):
             )
         
         return queryset.order_by('-published_at')
+    
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        posts = list(queryset) if page is None else page
+        attach_category_post_counts(posts)
+        
+        serializer = self.get_serializer(posts, many=True)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
 
 
 class PostDetailView(generics.RetrieveAPIView):
@@ -66,20 +181,24 @@ class PostDetailView(generics.RetrieveAPIView):
         return Post.objects.filter(
             status='published',
             published_at__lte=timezone.now()
-        ).select_related('author', 'category').prefetch_related('tags')
+        ).select_related('author', 'category').prefetch_related(tags_with_counts_prefetch(), approved_comments_prefetch())
     
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
         
-        # Track view
+        # Track view; repeat visits from the same IP are answered from the cache
         client_ip = self.get_client_ip()
-        PostView.objects.get_or_create(
-            post=instance,
-            ip_address=client_ip,
-            defaults={'user_agent': request.META.get('HTTP_USER_AGENT', '')}
-        )
+        if cache.add(f'pv:{instance.pk}:{client_ip}', 1, POST_VIEW_DEDUPE_SECONDS):
+            # First view from this IP: one INSERT, the unique constraint drops races
+            PostView.objects.bulk_create([
+                PostView(
+                    post=instance,
+                    ip_address=client_ip,
+                    user_agent=request.META.get('HTTP_USER_AGENT', '')
+                )
+            ], ignore_conflicts=True)
         
-        # Increment view count
+        # Increment view count; one atomic UPDATE ... SET views = views + 1
         instance.increment_views()
         
         serializer = self.get_serializer(instance)
@@ -94,7 +213,7 @@ class PostDetailView(generics.RetrieveAPIView):
         return ip
 
 
-class CategoryListView(generics.ListAPIView):
+class CategoryListView(CachedPublicListMixin, generics.ListAPIView):
     """Public view to list all categories with post counts"""
     serializer_class = CategorySerializer
     permission_classes = [permissions.AllowAny]
@@ -105,7 +224,7 @@ class CategoryListView(generics.ListAPIView):
         ).filter(post_count__gt=0).order_by('name')
 
 
-class TagListView(generics.ListAPIView):
+class TagListView(CachedPublicListMixin, generics.ListAPIView):
     """Public view to list all tags with post counts"""
     serializer_class = TagSerializer
     permission_classes = [permissions.AllowAny]
@@ -120,28 +239,38 @@ class TagListView(generics.ListAPIView):
 @permission_classes([permissions.AllowAny])
 def blog_stats(request):
     """Get blog statistics for homepage"""
-    total_posts = Post.objects.filter(status='published').count()
-    total_categories = Category.objects.annotate(
+    return Response(cached_public_data(request, _build_blog_stats))
+
+
+def _build_blog_stats():
+    published_posts = Post.objects.filter(status='published')
+    categories = Category.objects.annotate(
         post_count=Count('posts', filter=Q(posts__status='published'))
-    ).filter(post_count__gt=0).count()
-    total_tags = Tag.objects.annotate(
+    ).filter(post_count__gt=0)
+    tags = Tag.objects.annotate(
         post_count=Count('posts', filter=Q(posts__status='published'))
-    ).filter(post_count__gt=0).count()
-    total_views = Post.objects.aggregate(
-        total_views=Sum('views')
-    )['total_views'] or 0
+    ).filter(post_count__gt=0)
     
-    popular_posts = Post.objects.filter(
-        status='published'
-    ).order_by('-views')[:5]
+    post_totals = published_posts.aggregate(total_posts=Count('id'), total_views=Sum('views'))
+    total_posts = post_totals['total_posts']
+    total_views = post_totals['total_views'] or 0
+    # One pass over the annotated categories gives both the total and the
+    # per-category counts the nested CategorySerializers would otherwise query
+    category_counts = dict(categories.order_by().values_list('id', 'post_count'))
+    total_categories = len(category_counts)
+    total_tags = tags.count()
     
-    recent_posts = Post.objects.filter(
-        status='published'
-    ).order_by('-published_at')[:5]
-    
-    categories_with_counts = Category.objects.annotate(
-        post_count=Count('posts', filter=Q(posts__status='published'))
-    ).filter(post_count__gt=0).order_by('-post_count')[:10]
+    # Rank by id only, then hydrate the union of both lists once
+    popular_ids = list(published_posts.order_by('-views').values_list('id', flat=True)[:5])
+    recent_ids = list(published_posts.order_by('-published_at').values_list('id', flat=True)[:5])
+    posts_by_id = post_list_columns(
+        Post.objects.select_related('author', 'category').prefetch_related(tags_with_counts_prefetch())
+    ).in_bulk({*popular_ids, *recent_ids})
+    for post in posts_by_id.values():
+        post.category.post_count = category_counts.get(post.category_id, 0)
+    popular_posts = [posts_by_id[pk] for pk in popular_ids]
+    recent_posts = [posts_by_id[pk] for pk in recent_ids]
+    categories_with_counts = list(categories.order_by('-post_count')[:10])
     
     stats_data = {
         'total_posts': total_posts,
@@ -153,8 +282,7 @@ def blog_stats(request):
         'categories_with_counts': categories_with_counts,
     }
     
-    serializer = BlogStatsSerializer(stats_data)
-    return Response(serializer.data)
+    return BlogStatsSerializer(stats_data).data
 
 
 @api_view(['POST'])
@@ -190,7 +318,7 @@ class AdminPostDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [permissions.IsAuthenticated, permissions.IsAdminUser]
     
     def get_queryset(self):
-        return Post.objects.select_related('author', 'category').prefetch_related('tags')
+        return Post.objects.select_related('author', 'category').prefetch_related(tags_with_counts_prefetch(), approved_comments_prefetch())
 
 
 class AdminCategoryListCreateView(generics.ListCreateAPIView):
@@ -215,10 +343,11 @@ class AdminCommentListView(generics.ListAPIView):
     """Admin view to list all comments"""
     serializer_class = CommentSerializer
     permission_classes = [permissions.IsAuthenticated, permissions.IsAdminUser]
-    pagination_class = BlogPagination
+    pagination_class = CachedBlogPagination
     
     def get_queryset(self):
-        return Comment.objects.select_related('post').order_by('-created_at')
+        # CommentSerializer never touches the post, so skip the join
+        return Comment.objects.only('id', 'name', 'email', 'content', 'created_at').order_by('-created_at')
 
 
 @api_view(['PATCH'])
@@ -237,18 +366,26 @@ def approve_comment(request, comment_id):
 @permission_classes([permissions.IsAuthenticated, permissions.IsAdminUser])
 def admin_blog_stats(request):
     """Get detailed blog statistics for admin dashboard"""
-    from django.db.models import Sum
-    
-    total_posts = Post.objects.count()
-    published_posts = Post.objects.filter(status='published').count()
-    draft_posts = Post.objects.filter(status='draft').count()
+    status_counts = dict(Post.objects.order_by().values_list('status').annotate(n=Count('id')))
+    total_posts = sum(status_counts.values())
+    published_posts = status_counts.get('published', 0)
+    draft_posts = status_counts.get('draft', 0)
     total_views = Post.objects.aggregate(total_views=Sum('views'))['total_views'] or 0
-    total_comments = Comment.objects.count()
-    approved_comments = Comment.objects.filter(is_approved=True).count()
+    approval_counts = dict(Comment.objects.order_by().values_list('is_approved').annotate(n=Count('id')))
+    total_comments = sum(approval_counts.values())
+    approved_comments = approval_counts.get(True, 0)
+    
+    listed_posts = post_list_columns(
+        Post.objects.select_related('author', 'category').prefetch_related(tags_with_counts_prefetch())
+    )
+    recent_posts = list(listed_posts.order_by('-created_at')[:5])
+    popular_posts = list(listed_posts.order_by('-views')[:5])
+    attach_category_post_counts(recent_posts + popular_posts)
+    # One serializer pass over both lists, split back afterwards
+    post_data = PostListSerializer(recent_posts + popular_posts, many=True).data
     
-    recent_posts = Post.objects.order_by('-created_at')[:5]
-    popular_posts = Post.objects.order_by('-views')[:5]
-    pending_comments = Comment.objects.filter(is_approved=False).order_by('-created_at')[:5]
+    pending_count = approval_counts.get(False, 0)
+    pending_list = list(Comment.objects.filter(is_approved=False).order_by('-created_at')[:5])
     
     stats = {
         'total_posts': total_posts,
@@ -257,10 +394,10 @@ def admin_blog_stats(request):
         'total_views': total_views,
         'total_comments': total_comments,
         'approved_comments': approved_comments,
-        'pending_comments': Comment.objects.filter(is_approved=False).count(),
-        'recent_posts': PostListSerializer(recent_posts, many=True).data,
-        'popular_posts': PostListSerializer(popular_posts, many=True).data,
-        'pending_comments': CommentSerializer(pending_comments, many=True).data,
+        'pending_comments_count': pending_count,
+        'recent_posts': post_data[:len(recent_posts)],
+        'popular_posts': post_data[len(recent_posts):],
+        'pending_comments': CommentSerializer(pending_list, many=True).data,
     }
     
     return Response(stats)
@@ -31,7 +31,7 @@ class ContactSubmissionSerializer(serializers.ModelSerializer):
 
 class ContactSubmissionListSerializer(serializers.ModelSerializer):
     """Serializer for listing contact submissions (admin only)"""
-    full_name = serializers.SerializerMethodField()
+    full_name = serializers.ReadOnlyField()
     
     class Meta:
         model = ContactSubmission
@@ -41,14 +41,11 @@ class ContactSubmissionListSerializer(serializers.ModelSerializer):
             'replied_at', 'ip_address'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'replied_at']
-    
-    def get_full_name(self, obj):
-        return obj.full_name
 
 
 class ContactSubmissionDetailSerializer(serializers.ModelSerializer):
     """Serializer for contact submission details (admin only)"""
-    full_name = serializers.SerializerMethodField()
+    full_name = serializers.ReadOnlyField()
     
     class Meta:
         model = ContactSubmission
@@ -58,9 +55,6 @@ class ContactSubmissionDetailSerializer(serializers.ModelSerializer):
             'replied_at', 'ip_address'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'replied_at', 'ip_address']
-    
-    def get_full_name(self, obj):
-        return obj.full_name
 
 
 
@@ -1,3 +1,50 @@
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from .models import ContactSubmission
+
+User = get_user_model()
+
+
+class ContactSubmissionListQueryCountTests(TestCase):
+    """
+    Pin the queries behind the admin contact list, so filtering or
+    serialization can't regress into per-row queries
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username='staff', email='staff@example.com', password='pass-for-tests-only',
+            first_name='Sam', last_name='Staff', is_staff=True,
+        )
+        ContactSubmission.objects.bulk_create([
+            ContactSubmission(
+                first_name='Jane',
+                last_name='Smith' if index % 2 else 'Doe',
+                email=f'person{index}@example.com',
+                message='Question about courses',
+                status='new' if index % 3 else 'read',
+            )
+            for index in range(9)
+        ])
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.url = reverse('contacts:admin_contact_list')
+    
+    def test_list(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 9)
+    
+    def test_filtered_search(self):
+        # Status filter and substring search stay a single query
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, {'status': 'new', 'search': 'mith'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 3)
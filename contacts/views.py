@@ -1,7 +1,8 @@
 from rest_framework import generics, status, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from django.db.models import Q
+from django.db.models import Q, Count
+from django.db.models.functions import Now
 from .models import ContactSubmission
 from .serializers import (
     ContactSubmissionSerializer,
@@ -73,6 +74,18 @@ class ContactSubmissionListView(generics.ListAPIView):
             )
         
         return queryset.order_by('-created_at')
+    
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        
+        # Unpaginated: stream rows in chunks instead of caching every instance
+        serializer = self.get_serializer(queryset.iterator(chunk_size=500), many=True)
+        return Response(serializer.data)
 
 
 class ContactSubmissionDetailView(generics.RetrieveUpdateDestroyAPIView):
@@ -89,18 +102,14 @@ class ContactSubmissionDetailView(generics.RetrieveUpdateDestroyAPIView):
         serializer = self.get_serializer(instance, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         
-        # If status is being updated to 'replied', set replied_at
-        if 'status' in request.data and request.data['status'] == 'replied':
-            instance.mark_as_replied()
-            return Response(serializer.data)
-        
-        # If status is being updated to 'read', mark as read
-        if 'status' in request.data and request.data['status'] == 'read':
-            instance.mark_as_read()
-            return Response(serializer.data)
+        # One UPDATE for every branch; update() skips auto_now, so stamp updated_at here
+        changes = dict(serializer.validated_data, updated_at=Now())
+        if changes.get('status') == 'replied':
+            changes['replied_at'] = Now()
+        ContactSubmission.objects.filter(pk=instance.pk).update(**changes)
+        instance.refresh_from_db(fields=list(changes))
         
-        self.perform_update(serializer)
-        return Response(serializer.data)
+        return Response(self.get_serializer(instance).data)
 
 
 @api_view(['GET'])
@@ -110,16 +119,14 @@ def contact_stats(request):
     Get statistics about contact submissions.
     Admin only.
     """
-    total = ContactSubmission.objects.count()
-    new = ContactSubmission.objects.filter(status='new').count()
-    read = ContactSubmission.objects.filter(status='read').count()
-    replied = ContactSubmission.objects.filter(status='replied').count()
-    archived = ContactSubmission.objects.filter(status='archived').count()
+    counts = dict(
+        ContactSubmission.objects.order_by().values_list('status').annotate(n=Count('id'))
+    )
     
     return Response({
-        'total': total,
-        'new': new,
-        'read': read,
-        'replied': replied,
-        'archived': archived,
+        'total': sum(counts.values()),
+        'new': counts.get('new', 0),
+        'read': counts.get('read', 0),
+        'replied': counts.get('replied', 0),
+        'archived': counts.get('archived', 0),
     })
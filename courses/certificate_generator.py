@@ -4,9 +4,15 @@ Creates beautiful PNG certificates using PIL/Pillow
 """
 from PIL import Image, ImageDraw, ImageFont
 from io import BytesIO
-from django.core.files.base import ContentFile
+from concurrent.futures import ProcessPoolExecutor
+from django.core.files import File
 from datetime import datetime
+import functools
+import logging
 import os
+import threading
+
+logger = logging.getLogger(__name__)
 
 
 # Centre coordinates (x, y) of each grade checkbox on the template (2000×1414)
@@ -16,9 +22,80 @@ GRADE_BOX_CENTERS = {
     'upper_credit': (1412, 962),
     'distinction': (1828, 962),
 }
+GRADE_FONT_SIZE = 60
+
+# Text drawn on every certificate: (field, xy, font size, anchor, render)
+TEXT_LAYOUT = (
+    # Certificate ID — placed just after the printed "CERT ID:" label
+    ('certificate_id', (430, 438), 38, 'lm', str),
+    # Recipient name — centred on the line under "This certificate is presented to:"
+    ('student_name', (1000, 655), 85, 'mm', str.upper),
+    # Course name — centred on the second line ("...has been awarded a ___")
+    ('course_title', (1000, 805), 68, 'mm', str),
+    # Graduation date — on the line above the "Graduation Date" label
+    ('completed_date', (810, 1165), 40, 'mm', lambda date: date.strftime('%d %B, %Y').upper()),
+)
+
+# Your custom certificate design; every overlay coordinate above is laid out for TEMPLATE_SIZE
+TEMPLATE_PATH = "media/certificates/certificate_template.png"  # Change this to your template filename
+TEMPLATE_SIZE = (2000, 1414)
+
+_base_lock = threading.Lock()
+_base = None
+
+
+def _base_image():
+    """
+    Copy of the certificate background. The template is read and decompressed
+    once per process; if it is missing, a blank canvas of the same size is
+    cached instead so the check isn't repeated on every certificate.
+    """
+    global _base
+    if _base is None:
+        with _base_lock:
+            if _base is None:
+                try:
+                    with Image.open(TEMPLATE_PATH) as template:
+                        _base = template.convert('RGB')
+                except FileNotFoundError:
+                    logger.warning('Certificate template %s not found; using a blank background', TEMPLATE_PATH)
+                    _base = Image.new('RGB', TEMPLATE_SIZE, color='#f8f9fa')
+    return _base.copy()
+
+
+def reload_template():
+    """
+    Drop the cached background so the next certificate re-reads TEMPLATE_PATH
+    """
+    global _base
+    with _base_lock:
+        _base = None
 
 
-def generate_certificate_png(student_name, course_title, certificate_id, issued_date=None, completed_date=None, render_course_title=False, grade=None):
+# Fonts for text overlay (customize for your template); the first one present is used
+FONT_PATHS = [
+    "/usr/share/fonts/truetype/dejavu/DejaVuSerif-Bold.ttf",
+    "/usr/share/fonts/truetype/liberation/LiberationSerif-Bold.ttf",
+    "C:/Windows/Fonts/arial.ttf",
+    "C:/Windows/Fonts/times.ttf",
+]
+FONT_PATH = next((path for path in FONT_PATHS if os.path.exists(path)), None)
+
+
+@functools.lru_cache(maxsize=32)
+def _font(size):
+    """
+    Parsed TrueType font at the given size, shared by every certificate
+    """
+    if FONT_PATH:
+        try:
+            return ImageFont.truetype(FONT_PATH, size)
+        except OSError:
+            pass
+    return ImageFont.load_default()
+
+
+def generate_certificate_png(student_name, course_title, certificate_id, issued_date=None, completed_date=None, render_course_title=False, grade=None, image_format='PNG'):
     """
     Generate a PNG certificate using your custom design
 
@@ -31,89 +108,40 @@ def generate_certificate_png(student_name, course_title, certificate_id, issued_
             so the course title is not drawn.
         grade: One of 'pass', 'lower_credit', 'upper_credit', 'distinction'.
             When set, an X is placed in the matching checkbox.
+        image_format: 'PNG' (lossless, for downloads) or 'WEBP' (a fraction
+            of the size and encode time, for on-screen viewing).
 
     Returns:
-        BytesIO object containing the PNG image
+        BytesIO object containing the encoded image
     """
-    # Load your custom certificate design
-    template_path = "media/certificates/certificate_template.png"  # Change this to your template filename
-
-    try:
-        # Open your template image
-        img = Image.open(template_path).convert('RGB')
-        width, height = img.size
-    except FileNotFoundError:
-        # Fallback: create a blank certificate if template not found
-        width = 3508
-        height = 2480
-        img = Image.new('RGB', (width, height), color='#f8f9fa')
+    # Start from a copy of the cached template (or blank fallback) image
+    img = _base_image()
     draw = ImageDraw.Draw(img)
 
-    # Load fonts for text overlay (customize for your template)
-    font_paths = [
-        "/usr/share/fonts/truetype/dejavu/DejaVuSerif-Bold.ttf",
-        "/usr/share/fonts/truetype/liberation/LiberationSerif-Bold.ttf",
-        "C:/Windows/Fonts/arial.ttf",
-        "C:/Windows/Fonts/times.ttf",
-    ]
-
-    # Load fonts with sizes appropriate for your template
-    student_name_font = None
-    course_name_font = None
-    certificate_id_font = None
-    date_font = None
-    grade_font = None
-
-    for font_path in font_paths:
-        try:
-            if os.path.exists(font_path):
-                student_name_font = ImageFont.truetype(font_path, 85)   # Recipient name
-                course_name_font = ImageFont.truetype(font_path, 68)     # Course name
-                certificate_id_font = ImageFont.truetype(font_path, 38)  # Certificate ID
-                date_font = ImageFont.truetype(font_path, 40)            # Graduation date
-                grade_font = ImageFont.truetype(font_path, 60)           # Grade checkbox mark
-                break
-        except:
-            continue
-
-    # Fallback fonts
-    if not student_name_font:
-        default_font = ImageFont.load_default()
-        student_name_font = default_font
-        course_name_font = default_font
-        certificate_id_font = default_font
-        date_font = default_font
-        grade_font = default_font
-
     # ── Text overlays (coordinates match certificate_template.png, 2000×1414) ──
-
-    # Certificate ID — placed just after the printed "CERT ID:" label
-    draw.text((430, 438), certificate_id,
-              fill='#000000', font=certificate_id_font, anchor='lm')  # Left-middle anchor
-
-    # Recipient name — centred on the line under "This certificate is presented to:"
-    draw.text((1000, 655), student_name.upper(),
-              fill='#000000', font=student_name_font, anchor='mm')  # Center anchor
-
-    # Course name — centred on the second line ("...has been awarded a ___")
-    if course_title:
-        draw.text((1000, 805), course_title,
-                  fill='#000000', font=course_name_font, anchor='mm')  # Center anchor
+    values = {
+        'certificate_id': certificate_id,
+        'student_name': student_name,
+        'course_title': course_title,
+        'completed_date': completed_date,
+    }
+    for field, xy, font_size, anchor, render in TEXT_LAYOUT:
+        value = values[field]
+        if value:
+            draw.text(xy, render(value), fill='#000000', font=_font(font_size), anchor=anchor)
 
     # Grade — X in the matching checkbox (Pass / Lower Credit / Upper Credit / Distinction)
     if grade and grade in GRADE_BOX_CENTERS:
         draw.text(GRADE_BOX_CENTERS[grade], 'X',
-                  fill='#000000', font=grade_font, anchor='mm')
-
-    # Graduation date — on the line above the "Graduation Date" label
-    if completed_date:
-        completion_text = completed_date.strftime('%d %B, %Y').upper()
-        draw.text((810, 1165), completion_text,
-                  fill='#000000', font=date_font, anchor='mm')
+                  fill='#000000', font=_font(GRADE_FONT_SIZE), anchor='mm')
 
     # Save to BytesIO
     img_buffer = BytesIO()
-    img.save(img_buffer, format='PNG', quality=95, dpi=(300, 300))
+    if image_format == 'WEBP':
+        img.save(img_buffer, format='WEBP', quality=90, method=4)
+    else:
+        # Fast Deflate: a slightly larger file for a fraction of the encode time
+        img.save(img_buffer, format='PNG', compress_level=1, dpi=(300, 300))
     img_buffer.seek(0)
     
     return img_buffer
@@ -121,7 +149,7 @@ def generate_certificate_png(student_name, course_title, certificate_id, issued_
 
 def save_certificate_image(certificate, student_name, course_title, certificate_id, issued_date=None, completed_date=None):
     """
-    Generate and save certificate PNG to the certificate model
+    Generate and save certificate image to the certificate model
     
     Args:
         certificate: Certificate model instance
@@ -133,24 +161,52 @@ def save_certificate_image(certificate, student_name, course_title, certificate_
     Returns:
         The certificate instance with image_file saved
     """
-    # Generate the PNG
+    # Generate the image; stored certificates are only viewed on screen, so WebP
     img_buffer = generate_certificate_png(
         student_name=student_name,
         course_title=course_title,
         certificate_id=certificate_id,
         issued_date=issued_date,
-        completed_date=completed_date
+        completed_date=completed_date,
+        image_format='WEBP'
     )
     
+    return store_certificate_image(certificate, certificate_id, img_buffer)
+
+
+def store_certificate_image(certificate, certificate_id, img_buffer):
+    """
+    Save an encoded WebP certificate buffer to the certificate model
+    """
     # Create filename
-    filename = f"certificate_{certificate_id}_{certificate.student.id}.png"
+    filename = f"certificate_{certificate_id}_{certificate.student_id}.webp"
     
     # Save to the certificate model
+    # Hand the buffer itself to storage rather than copying its bytes out first
     certificate.image_file.save(
         filename,
-        ContentFile(img_buffer.read()),
+        File(img_buffer, name=filename),
         save=True
     )
     
     return certificate
 
+
+def _render_certificate(spec):
+    return generate_certificate_png(**spec).getvalue()
+
+
+def generate_certificates_batch(specs, max_workers=None):
+    """
+    Render many certificates across CPU cores.
+
+    Args:
+        specs: Iterable of generate_certificate_png keyword-argument dicts
+        max_workers: Process count (defaults to the number of CPUs)
+
+    Returns:
+        List of encoded image bytes, in the same order as specs
+    """
+    # Rendering never touches the database, so worker processes need no Django setup
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_render_certificate, specs, chunksize=4))
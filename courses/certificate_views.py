@@ -1,12 +1,25 @@
 """
 Custom views for serving certificate images with proper headers
 """
-from django.http import HttpResponse, Http404
+from django.http import HttpResponse, HttpResponseNotModified, FileResponse, Http404
+from django.utils.http import http_date, parse_etags
 from django.views.decorators.cache import cache_control
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 from django.conf import settings
 import os
+from pathlib import Path
+
+
+CERTIFICATES_DIR = Path(settings.MEDIA_ROOT, 'certificates').resolve()
+
+IMAGE_CONTENT_TYPES = {
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.gif': 'image/gif',
+    '.webp': 'image/webp',
+}
 
 
 @csrf_exempt
@@ -25,43 +38,43 @@ def serve_certificate_image(request, path):
         return response
     
     # Construct the full file path
-    file_path = os.path.join(settings.MEDIA_ROOT, 'certificates', path)
-    
-    # Normalize paths for security check
-    media_root = os.path.abspath(settings.MEDIA_ROOT)
-    file_path_abs = os.path.abspath(file_path)
+    file_path = (CERTIFICATES_DIR / path).resolve()
     
-    # Security check: ensure the file is within MEDIA_ROOT/certificates
-    certificates_dir = os.path.join(media_root, 'certificates')
-    if not file_path_abs.startswith(os.path.abspath(certificates_dir)):
+    # Security check: ensure the file is within MEDIA_ROOT/certificates.
+    # A path-component check, so a sibling like certificates_evil/ doesn't pass.
+    if not file_path.is_relative_to(CERTIFICATES_DIR):
         raise Http404("Invalid file path")
     
     # Check if file exists
-    if not os.path.exists(file_path):
+    try:
+        file_stat = os.stat(file_path)
+    except OSError:
         raise Http404("Certificate image not found")
     
-    # Read the file
+    # Rendered certificates don't change in place, so mtime + size identify the content
+    etag = f'"{int(file_stat.st_mtime)}-{file_stat.st_size}"'
+    if etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        response['Cache-Control'] = 'public, max-age=3600'
+        response['Access-Control-Allow-Origin'] = '*'
+        return response
+    
+    # Open the file; FileResponse streams it (sendfile where the server supports it)
     try:
-        with open(file_path, 'rb') as f:
-            image_data = f.read()
+        image_file = open(file_path, 'rb')
     except IOError:
         raise Http404("Error reading certificate image")
     
     # Determine content type based on file extension
-    content_type = 'image/png'  # Default to PNG
-    if file_path.lower().endswith('.png'):
-        content_type = 'image/png'
-    elif file_path.lower().endswith('.jpg') or file_path.lower().endswith('.jpeg'):
-        content_type = 'image/jpeg'
-    elif file_path.lower().endswith('.gif'):
-        content_type = 'image/gif'
-    elif file_path.lower().endswith('.webp'):
-        content_type = 'image/webp'
+    content_type = IMAGE_CONTENT_TYPES.get(file_path.suffix.lower(), 'image/png')  # Default to PNG
     
     # Create response with proper headers
-    response = HttpResponse(image_data, content_type=content_type)
-    response['Content-Length'] = str(len(image_data))
-    response['Content-Disposition'] = f'inline; filename="{os.path.basename(file_path)}"'
+    response = FileResponse(image_file, content_type=content_type)
+    response['Content-Length'] = str(file_stat.st_size)
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(file_stat.st_mtime)
+    response['Content-Disposition'] = f'inline; filename="{file_path.name}"'
     response['Cache-Control'] = 'public, max-age=3600'
     response['Access-Control-Allow-Origin'] = '*'  # Allow CORS for images
     response['Access-Control-Allow-Methods'] = 'GET, OPTIONS'
@@ -1,4 +1,5 @@
 from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
 from django.utils import timezone
 from courses.models import Lesson, Quiz, QuizQuestion
 import random
@@ -64,12 +65,13 @@ class Command(BaseCommand):
     def generate_quizzes_for_course(self, course_id, num_questions, difficulty):
         """Generate quizzes for all lessons in a course"""
         lessons = Lesson.objects.filter(course_id=course_id)
-        if not lessons:
+        if not lessons.exists():
             raise CommandError(f'No lessons found for course ID {course_id}')
 
+        # Filter out lessons with a quiz in SQL rather than probing each one
         generated = 0
-        for lesson in lessons:
-            if not hasattr(lesson, 'quiz'):
+        with transaction.atomic():
+            for lesson in lessons.exclude(quiz__isnull=False):
                 self.create_quiz_for_lesson(lesson, num_questions, difficulty)
                 generated += 1
 
@@ -88,8 +90,9 @@ class Command(BaseCommand):
 
         self.stdout.write(f'Generating quizzes for {total} lessons...')
 
-        for lesson in lessons_without_quiz:
-            self.create_quiz_for_lesson(lesson, num_questions, difficulty)
+        with transaction.atomic():
+            for lesson in lessons_without_quiz:
+                self.create_quiz_for_lesson(lesson, num_questions, difficulty)
 
         self.stdout.write(
             self.style.SUCCESS(f'Successfully generated quizzes for {total} lessons')
@@ -111,8 +114,8 @@ class Command(BaseCommand):
         # Generate questions based on lesson content and difficulty
         questions_data = self.generate_questions_for_lesson(lesson, num_questions, difficulty)
 
-        for i, question_data in enumerate(questions_data, 1):
-            QuizQuestion.objects.create(
+        QuizQuestion.objects.bulk_create([
+            QuizQuestion(
                 quiz=quiz,
                 question_text=question_data['question'],
                 question_type=question_data['type'],
@@ -122,6 +125,8 @@ class Command(BaseCommand):
                 correct_answer=question_data['correct_answer'],
                 acceptable_answers=question_data.get('acceptable_answers', [])
             )
+            for i, question_data in enumerate(questions_data, 1)
+        ], batch_size=500)
 
         return quiz
 
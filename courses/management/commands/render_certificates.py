@@ -0,0 +1,56 @@
+"""
+Render certificate images in bulk, e.g. after the template changes or for
+certificates left for it by CERTIFICATE_IMAGES_DEFERRED (run it on a schedule).
+
+    python manage.py render_certificates              # only certificates without an image
+    python manage.py render_certificates --all        # re-render every certificate
+    python manage.py render_certificates --workers 4  # cap the worker processes
+"""
+
+from io import BytesIO
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from courses.certificate_generator import generate_certificates_batch, store_certificate_image
+from courses.models import Certificate
+
+
+class Command(BaseCommand):
+    help = 'Render certificate images in parallel worker processes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true',
+                            help='Re-render every certificate, not just those without an image.')
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Number of worker processes (default: CPU count).')
+
+    def handle(self, *args, **options):
+        certificates = Certificate.objects.select_related('student', 'course', 'enrollment')
+        if not options['all']:
+            certificates = certificates.filter(Q(image_file='') | Q(image_file__isnull=True))
+        certificates = list(certificates)
+
+        if not certificates:
+            self.stdout.write('No certificates to render.')
+            return
+
+        self.stdout.write(f'Rendering {len(certificates)} certificates…')
+        # Same arguments generate_certificate passes for a single certificate
+        specs = [
+            {
+                'student_name': f"{cert.student.first_name} {cert.student.last_name}",
+                'course_title': cert.course.title,
+                'certificate_id': cert.certificate_id,
+                'issued_date': cert.issued_at,
+                'completed_date': cert.enrollment.completed_at,
+                'image_format': 'WEBP',
+            }
+            for cert in certificates
+        ]
+        images = generate_certificates_batch(specs, max_workers=options['workers'])
+
+        for cert, image in zip(certificates, images):
+            store_certificate_image(cert, cert.certificate_id, BytesIO(image))
+
+        self.stdout.write(self.style.SUCCESS(f'Rendered {len(certificates)} certificates.'))
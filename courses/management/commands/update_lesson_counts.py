@@ -1,29 +1,40 @@
 from django.core.management.base import BaseCommand
-from courses.models import Course
+from django.db import transaction
+from django.db.models import Count
+from courses.models import Course, Lesson
 
 
 class Command(BaseCommand):
     help = 'Update lesson counts for all courses'
 
     def handle(self, *args, **options):
-        courses = Course.objects.all()
-        updated_count = 0
+        # Same rule as Course.update_lesson_count, for every course in one query
+        counts = dict(
+            Lesson.objects.filter(is_published=True)
+            .order_by()
+            .values_list('course_id')
+            .annotate(n=Count('id'))
+        )
         
-        for course in courses:
+        changed = []
+        for course in Course.objects.only('id', 'title', 'total_lessons'):
             old_count = course.total_lessons
-            course.update_lesson_count()
-            new_count = course.total_lessons
+            new_count = counts.get(course.id, 0)
             
             if old_count != new_count:
-                updated_count += 1
+                course.total_lessons = new_count
+                changed.append(course)
                 self.stdout.write(
                     self.style.SUCCESS(
                         f'Updated {course.title}: {old_count} -> {new_count} lessons'
                     )
                 )
         
+        with transaction.atomic():
+            Course.objects.bulk_update(changed, ['total_lessons'], batch_size=500)
+        
         self.stdout.write(
             self.style.SUCCESS(
-                f'Successfully updated lesson counts for {updated_count} courses'
+                f'Successfully updated lesson counts for {len(changed)} courses'
             )
         )
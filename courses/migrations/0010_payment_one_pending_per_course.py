@@ -0,0 +1,37 @@
+from django.db import migrations, models
+
+
+def cancel_duplicate_pending_payments(apps, schema_editor):
+    # Concurrent initiates used to be able to leave several pending payments for one
+    # student and course; keep the newest of each group so the constraint can be added
+    Payment = apps.get_model('courses', 'Payment')
+    seen = set()
+    duplicates = []
+    pending = Payment.objects.filter(status='pending').order_by(
+        'student_id', 'course_id', '-created_at'
+    ).values_list('pk', 'student_id', 'course_id')
+    for pk, student_id, course_id in pending.iterator():
+        if (student_id, course_id) in seen:
+            duplicates.append(pk)
+        else:
+            seen.add((student_id, course_id))
+    Payment.objects.filter(pk__in=duplicates).update(status='cancelled')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0009_payment_student_course_status_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(cancel_duplicate_pending_payments, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='payment',
+            constraint=models.UniqueConstraint(
+                condition=models.Q(status='pending'),
+                fields=('student', 'course'),
+                name='payments_one_pending_per_course',
+            ),
+        ),
+    ]
@@ -1,8 +1,12 @@
+import uuid
+
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, F, OuterRef, Subquery
 from .models import Course, Payment, Enrollment
 from .payment_serializers import CreatePaymentSerializer
 
@@ -20,54 +24,77 @@ def mock_initiate_payment(request):
     currency = serializer.validated_data['currency']
     
     try:
-        course = Course.objects.get(id=course_id)
-        student = request.user
-        
-        # Check if user is already enrolled
-        if Enrollment.objects.filter(student=student, course=course).exists():
-            return Response({
-                'error': 'You are already enrolled in this course'
-            }, status=status.HTTP_400_BAD_REQUEST)
-        
-        # Check if user already has a pending payment for this course
-        existing_payment = Payment.objects.filter(
-            student=student,
-            course=course,
-            status='pending'
-        ).first()
-        
-        if existing_payment:
+        with transaction.atomic():
+            student = request.user
+            pending_payments = Payment.objects.filter(
+                student=student,
+                course=OuterRef('pk'),
+                status='pending'
+            )
+            
+            # Lock the course row so concurrent initiates for it are serialized, and
+            # check enrollment and pending payments in the same query
+            course = Course.objects.select_for_update().annotate(
+                already_enrolled=Exists(
+                    Enrollment.objects.filter(student=student, course=OuterRef('pk'))
+                ),
+                pending_payment_id=Subquery(pending_payments.values('id')[:1]),
+                pending_reference=Subquery(pending_payments.values('flutterwave_reference')[:1]),
+            ).get(id=course_id)
+            
+            # Check if user is already enrolled
+            if course.already_enrolled:
+                return Response({
+                    'error': 'You are already enrolled in this course'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            # Check if user already has a pending payment for this course
+            if course.pending_payment_id:
+                return Response({
+                    'message': 'You already have a pending payment for this course',
+                    'payment_url': f"{settings.FRONTEND_URL}/mock-payment?tx_ref={course.pending_reference}",
+                    'tx_ref': course.pending_reference,
+                    'payment_id': str(course.pending_payment_id)
+                }, status=status.HTTP_200_OK)
+            
+            # Create payment record; the id is generated here so the reference goes in the same INSERT
+            payment_id = uuid.uuid4()
+            try:
+                with transaction.atomic():
+                    payment = Payment.objects.create(
+                        id=payment_id,
+                        flutterwave_reference=f"MOCK-{payment_id}",
+                        student=student,
+                        course=course,
+                        amount=amount,
+                        currency=currency,
+                        status='pending'
+                    )
+            except IntegrityError:
+                # SQLite ignores the row lock; a concurrent initiate won the pending-payment constraint
+                existing_payment = Payment.objects.filter(
+                    student=student, course=course, status='pending'
+                ).first()
+                if existing_payment is None:
+                    raise
+                return Response({
+                    'message': 'You already have a pending payment for this course',
+                    'payment_url': f"{settings.FRONTEND_URL}/mock-payment?tx_ref={existing_payment.flutterwave_reference}",
+                    'tx_ref': existing_payment.flutterwave_reference,
+                    'payment_id': str(existing_payment.id)
+                }, status=status.HTTP_200_OK)
+            
+            # Return mock payment URL
             return Response({
-                'message': 'You already have a pending payment for this course',
-                'payment_url': f"{settings.FRONTEND_URL}/mock-payment?tx_ref={existing_payment.flutterwave_reference}",
-                'tx_ref': existing_payment.flutterwave_reference,
-                'payment_id': str(existing_payment.id)
+                'message': 'Mock payment initiated successfully',
+                'payment_id': str(payment.id),
+                'flutterwave_reference': payment.flutterwave_reference,
+                'payment_url': f"{settings.FRONTEND_URL}/mock-payment?tx_ref={payment.flutterwave_reference}",
+                'amount': float(amount),
+                'currency': currency,
+                'course_title': course.title
             }, status=status.HTTP_200_OK)
-        
-        # Create payment record
-        payment = Payment.objects.create(
-            student=student,
-            course=course,
-            amount=amount,
-            currency=currency,
-            status='pending'
-        )
-        
-        # Set the flutterwave reference after payment is created
-        payment.flutterwave_reference = f"MOCK-{payment.id}"
-        payment.save()
-        
-        # Return mock payment URL
-        return Response({
-            'message': 'Mock payment initiated successfully',
-            'payment_id': str(payment.id),
-            'flutterwave_reference': payment.flutterwave_reference,
-            'payment_url': f"{settings.FRONTEND_URL}/mock-payment?tx_ref={payment.flutterwave_reference}",
-            'amount': float(amount),
-            'currency': currency,
-            'course_title': course.title
-        }, status=status.HTTP_200_OK)
-        
+            
     except Course.DoesNotExist:
         return Response({
             'error': 'Course not found'
@@ -92,29 +119,33 @@ def mock_verify_payment(request):
         }, status=status.HTTP_400_BAD_REQUEST)
     
     try:
-        payment = Payment.objects.get(
-            flutterwave_reference=tx_ref,
-            student=request.user,
-            status='pending'
-        )
-        
-        # Mock successful payment
-        payment.status = 'completed'
-        payment.payment_method = 'mock_card'
-        payment.save()
-        
-        # Enroll user in the course
-        enrollment, created = Enrollment.objects.get_or_create(student=request.user, course=payment.course)
-        
-        # Update course student count if new enrollment
-        if created:
-            payment.course.total_students += 1
-            payment.course.save(update_fields=['total_students'])
-        
-        return Response({
-            'message': 'Mock payment verified and course enrolled successfully!'
-        }, status=status.HTTP_200_OK)
-        
+        with transaction.atomic():
+            # Lock the pending payment so a repeated verify waits and then finds it completed
+            # Only the columns written below; the course is never loaded
+            payment = Payment.objects.select_for_update().only(
+                'id', 'status', 'payment_method', 'course_id', 'updated_at'
+            ).get(
+                flutterwave_reference=tx_ref,
+                student=request.user,
+                status='pending'
+            )
+            
+            # Mock successful payment
+            payment.status = 'completed'
+            payment.payment_method = 'mock_card'
+            payment.save(update_fields=['status', 'payment_method', 'updated_at'])
+            
+            # Enroll user in the course
+            enrollment, created = Enrollment.objects.get_or_create(student=request.user, course_id=payment.course_id)
+            
+            # Update course student count if new enrollment; one UPDATE, no course fetch
+            if created:
+                Course.objects.filter(pk=payment.course_id).update(total_students=F('total_students') + 1)
+            
+            return Response({
+                'message': 'Mock payment verified and course enrolled successfully!'
+            }, status=status.HTTP_200_OK)
+            
     except Payment.DoesNotExist:
         return Response({
             'error': 'Payment not found'
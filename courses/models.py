@@ -2,10 +2,22 @@ from django.db import models
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+import re
 import uuid
 
 User = get_user_model()
 
+# Video ID from youtube.com/watch?v=<id> and youtu.be/<id> links
+YOUTUBE_ID_RE = re.compile(r'(?:youtube\.com/watch\?v=|youtu\.be/)([^&?]+)')
+
+
+def youtube_video_id(url):
+    """Extract the YouTube video ID from a URL, or None"""
+    match = YOUTUBE_ID_RE.search(url) if url else None
+    return match.group(1) if match else None
+
 
 class Category(models.Model):
     """
@@ -93,9 +105,13 @@ class Course(models.Model):
         super().save(*args, **kwargs)
     
     def update_lesson_count(self):
-        """Update the total_lessons count"""
-        self.total_lessons = self.lessons.filter(is_published=True).count()
-        self.save(update_fields=['total_lessons'])
+        """Update the total_lessons count in a single UPDATE ... (SELECT COUNT) query"""
+        published_count = Lesson.objects.filter(
+            course=OuterRef('pk'), is_published=True
+        ).order_by().values('course').annotate(count=Count('id')).values('count')
+        Course.objects.filter(pk=self.pk).update(
+            total_lessons=Coalesce(Subquery(published_count), 0)
+        )
     
     def get_thumbnail_url(self):
         if self.thumbnail:
@@ -104,12 +120,7 @@ class Course(models.Model):
     
     def get_preview_video_id(self):
         """Extract YouTube video ID from URL"""
-        if self.preview_video_url:
-            if 'youtube.com/watch?v=' in self.preview_video_url:
-                return self.preview_video_url.split('v=')[1].split('&')[0]
-            elif 'youtu.be/' in self.preview_video_url:
-                return self.preview_video_url.split('youtu.be/')[1].split('?')[0]
-        return None
+        return youtube_video_id(self.preview_video_url)
 
 
 class Lesson(models.Model):
@@ -154,23 +165,27 @@ class Lesson(models.Model):
     
     def get_video_id(self):
         """Extract YouTube video ID from URL"""
-        if self.video_url:
-            if 'youtube.com/watch?v=' in self.video_url:
-                return self.video_url.split('v=')[1].split('&')[0]
-            elif 'youtu.be/' in self.video_url:
-                return self.video_url.split('youtu.be/')[1].split('?')[0]
-        return None
+        return youtube_video_id(self.video_url)
     
     def save(self, *args, **kwargs):
         super().save(*args, **kwargs)
-        # Update course lesson count
-        self.course.update_lesson_count()
+        # Update course lesson count, unless the save can't have changed it
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or {'is_published', 'course', 'course_id'} & set(update_fields):
+            self._update_course_lesson_count(self.course_id, Lesson.course.is_cached(self))
     
     def delete(self, *args, **kwargs):
-        course = self.course
+        course_loaded = Lesson.course.is_cached(self)
         super().delete(*args, **kwargs)
         # Update course lesson count after deletion
-        course.update_lesson_count()
+        self._update_course_lesson_count(self.course_id, course_loaded)
+    
+    def _update_course_lesson_count(self, course_id, course_loaded):
+        # A pk-only stand-in takes the single UPDATE; only an already loaded
+        # course pays for re-reading its new count
+        Course(pk=course_id).update_lesson_count()
+        if course_loaded:
+            self.course.refresh_from_db(fields=['total_lessons'])
 
 
 class Quiz(models.Model):
@@ -384,6 +399,19 @@ class Payment(models.Model):
         verbose_name = 'Payment'
         verbose_name_plural = 'Payments'
         ordering = ['-created_at']
+        indexes = [
+            # Pending-payment lookup on every initiate call
+            models.Index(fields=['student', 'course', 'status'], name='payment_student_course_status'),
+        ]
+        constraints = [
+            # At most one pending payment per student and course; skipped on MySQL,
+            # which has no partial indexes (the initiate views lock the course row there)
+            models.UniqueConstraint(
+                fields=['student', 'course'],
+                condition=Q(status='pending'),
+                name='payments_one_pending_per_course',
+            ),
+        ]
     
     def __str__(self):
         return f"Payment {self.flutterwave_reference} - {self.student.full_name} - {self.course.title}"
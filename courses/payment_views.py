@@ -1,9 +1,13 @@
+import logging
 import requests
 import uuid
 import time
 from decimal import Decimal
 from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Max
 from django.utils import timezone
+from django.utils.http import http_date, parse_etags
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
@@ -15,6 +19,7 @@ from .payment_serializers import (
 )
 
 User = get_user_model()
+logger = logging.getLogger(__name__)
 
 
 @api_view(['POST'])
@@ -31,21 +36,50 @@ def initiate_payment(request):
     currency = serializer.validated_data['currency']
     
     try:
-        course = Course.objects.get(id=course_id)
         student = request.user
         
-        # Check if user is already enrolled
-        if Enrollment.objects.filter(student=student, course=course).exists():
-            return Response({
-                'error': 'You are already enrolled in this course'
-            }, status=status.HTTP_400_BAD_REQUEST)
-        
-        # Check if user already has a pending payment for this course
-        existing_payment = Payment.objects.filter(
-            student=student,
-            course=course,
-            status='pending'
-        ).first()
+        # Short transaction for the checks and the INSERT only; the gateway call below runs outside it
+        with transaction.atomic():
+            # Lock the course row so concurrent initiates for it are serialized; on MySQL this is
+            # the only guard, as the one-pending-payment constraint exists on SQLite/Postgres only
+            course = Course.objects.select_for_update().get(id=course_id)
+            
+            # Check if user is already enrolled
+            if Enrollment.objects.filter(student=student, course=course).exists():
+                return Response({
+                    'error': 'You are already enrolled in this course'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            # Check if user already has a pending payment for this course
+            existing_payment = Payment.objects.filter(
+                student=student,
+                course=course,
+                status='pending'
+            ).first()
+            
+            if existing_payment is None:
+                # Create payment record; the id doubles as the Flutterwave reference, so set both in one INSERT
+                payment_id = uuid.uuid4()
+                try:
+                    with transaction.atomic():
+                        payment = Payment.objects.create(
+                            id=payment_id,
+                            flutterwave_reference=str(payment_id),
+                            student=student,
+                            course=course,
+                            amount=amount,
+                            currency=currency,
+                            status='pending'
+                        )
+                except IntegrityError:
+                    # A concurrent initiate won the payments_one_pending_per_course constraint
+                    existing_payment = Payment.objects.filter(
+                        student=student,
+                        course=course,
+                        status='pending'
+                    ).first()
+                    if existing_payment is None:
+                        raise
         
         if existing_payment:
             # Return the existing payment URL instead of creating a new one
@@ -56,19 +90,6 @@ def initiate_payment(request):
                 'payment_id': str(existing_payment.id)
             }, status=status.HTTP_200_OK)
         
-        # Create payment record
-        payment = Payment.objects.create(
-            student=student,
-            course=course,
-            amount=amount,
-            currency=currency,
-            status='pending'
-        )
-        
-        # Set the Flutterwave reference
-        payment.flutterwave_reference = str(payment.id)
-        payment.save()
-        
         # Generate Flutterwave payment data
         flutterwave_data = {
             'tx_ref': payment.flutterwave_reference,
@@ -98,12 +119,10 @@ def initiate_payment(request):
             'Content-Type': 'application/json'
         }
         
-        print(f"🔑 Flutterwave Secret Key: {settings.FLUTTERWAVE_SECRET_KEY[:10]}...")
-        print(f"🔑 Full Secret Key Length: {len(settings.FLUTTERWAVE_SECRET_KEY)}")
-        print(f"🔑 Secret Key Empty: {not settings.FLUTTERWAVE_SECRET_KEY}")
-        print(f"💰 Original Amount: {payment.amount} Naira")
-        print(f"💰 Amount for Flutterwave: {payment.get_amount_in_kobo()} {currency}")
-        print(f"📦 Flutterwave Data: {flutterwave_data}")
+        if not settings.FLUTTERWAVE_SECRET_KEY:
+            logger.warning('FLUTTERWAVE_SECRET_KEY is empty; payment %s will be rejected', payment.id)
+        logger.debug('Initiating Flutterwave payment %s: %s %s, data=%s',
+                     payment.id, payment.get_amount_in_kobo(), currency, flutterwave_data)
         
         # Retry logic for Flutterwave API
         max_retries = 3
@@ -111,7 +130,7 @@ def initiate_payment(request):
         
         for attempt in range(max_retries):
             try:
-                print(f"🔄 Attempt {attempt + 1}/{max_retries} - Calling Flutterwave API...")
+                logger.debug('Flutterwave attempt %s/%s for payment %s', attempt + 1, max_retries, payment.id)
                 
                 # Try with different SSL configurations
                 if attempt == 0:
@@ -145,20 +164,18 @@ def initiate_payment(request):
                         timeout=30
                     )
                 
-                print(f"📡 Flutterwave Response Status: {response.status_code}")
-                print(f"📡 Flutterwave Response: {response.text}")
+                logger.debug('Flutterwave response %s: %s', response.status_code, response.text)
                 break  # Success, exit retry loop
                 
             except requests.exceptions.RequestException as e:
-                print(f"❌ Flutterwave Request Error (Attempt {attempt + 1}): {e}")
+                logger.warning('Flutterwave request error (attempt %s): %s', attempt + 1, e)
                 
                 if attempt < max_retries - 1:  # Not the last attempt
-                    print(f"⏳ Retrying in {retry_delay} seconds...")
                     time.sleep(retry_delay)
                     retry_delay *= 2  # Exponential backoff
                 else:
                     # Last attempt failed
-                    print(f"❌ All {max_retries} attempts failed")
+                    logger.error('All %s Flutterwave attempts failed for payment %s', max_retries, payment.id)
                     payment.status = 'failed'
                     payment.save()
                     return Response({
@@ -186,8 +203,7 @@ def initiate_payment(request):
                     'details': data.get('message', 'Unknown error')
                 }, status=status.HTTP_400_BAD_REQUEST)
         else:
-            print(f"❌ Flutterwave API Error: {response.status_code}")
-            print(f"❌ Response: {response.text}")
+            logger.error('Flutterwave API error %s: %s', response.status_code, response.text)
             return Response({
                 'error': 'Failed to connect to payment gateway',
                 'details': f"HTTP {response.status_code}: {response.text}"
@@ -290,6 +306,20 @@ def verify_payment(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+def _payment_etag(request, latest_update, count=1):
+    """
+    ETag for a set of the user's payments. Every save bumps updated_at, so the
+    newest timestamp plus the row count identifies the content.
+    Returns (etag, 304 response or None).
+    """
+    etag = f'"{count}-{latest_update.timestamp() if latest_update else 0}"'
+    if etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        response['ETag'] = etag
+        return etag, response
+    return etag, None
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def payment_history(request):
@@ -297,12 +327,21 @@ def payment_history(request):
     Get user's payment history
     """
     payments = Payment.objects.filter(student=request.user).order_by('-created_at')
-    serializer = PaymentSerializer(payments, many=True)
     
-    return Response({
+    # One aggregate decides whether the client's copy is still current
+    summary = payments.aggregate(total=Count('id'), latest_update=Max('updated_at'))
+    etag, not_modified = _payment_etag(request, summary['latest_update'], summary['total'])
+    if not_modified:
+        return not_modified
+    
+    serializer = PaymentSerializer(payments.select_related('course', 'student'), many=True)
+    
+    response = Response({
         'payments': serializer.data,
-        'total': payments.count()
+        'total': summary['total']
     }, status=status.HTTP_200_OK)
+    response['ETag'] = etag
+    return response
 
 
 @api_view(['GET'])
@@ -311,13 +350,23 @@ def payment_status(request, payment_id):
     """
     Get payment status by ID
     """
+    payments = Payment.objects.filter(id=payment_id, student=request.user)
     try:
-        payment = Payment.objects.get(id=payment_id, student=request.user)
+        # Only the timestamp is read before deciding to serialize; clients polling status mostly get a 304
+        updated_at = payments.values_list('updated_at', flat=True).get()
+        etag, not_modified = _payment_etag(request, updated_at)
+        if not_modified:
+            return not_modified
+        
+        payment = payments.select_related('course', 'student').get()
         serializer = PaymentSerializer(payment)
         
-        return Response({
+        response = Response({
             'payment': serializer.data
         }, status=status.HTTP_200_OK)
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(updated_at.timestamp())
+        return response
         
     except Payment.DoesNotExist:
         return Response({
@@ -6,6 +6,7 @@ from rest_framework.exceptions import PermissionDenied
 from django.shortcuts import get_object_or_404
 from django.db.models import Q, Avg, Count
 from django.utils import timezone
+from django.conf import settings
 from django.contrib.auth import get_user_model
 
 from .models import (
@@ -712,116 +713,6 @@ def get_tutor_course_stats(request, course_id):
     return Response(stats)
 
 
-@api_view(['GET'])
-@permission_classes([permissions.IsAuthenticated])
-def get_student_certificates(request):
-    """Get all certificates for the authenticated student"""
-    if request.user.role != 'student':
-        return Response(
-            {'error': 'Only students can access certificates'},
-            status=status.HTTP_403_FORBIDDEN
-        )
-    
-    certificates = Certificate.objects.filter(
-        student=request.user
-    ).select_related('course', 'enrollment').order_by('-issued_at')
-    
-    serializer = CertificateSerializer(certificates, many=True, context={'request': request})
-    return Response(serializer.data)
-
-
-@api_view(['POST'])
-@permission_classes([permissions.IsAuthenticated])
-def generate_certificate(request, enrollment_id):
-    """Generate a certificate for a completed course"""
-    if request.user.role != 'student':
-        return Response(
-            {'error': 'Only students can generate certificates'},
-            status=status.HTTP_403_FORBIDDEN
-        )
-    
-    try:
-        enrollment = get_object_or_404(
-            Enrollment,
-            id=enrollment_id,
-            student=request.user,
-            is_completed=True
-        )
-        
-        # Check if certificate already exists
-        certificate, created = Certificate.objects.get_or_create(
-            student=request.user,
-            course=enrollment.course,
-            enrollment=enrollment,
-            defaults={
-                'certificate_id': f"C{abs(hash(str(enrollment.id))) % 10000:04d}"  # 5 characters: C + 4-digit number
-            }
-        )
-        
-        # Generate PNG certificate image if it doesn't exist or if newly created
-        if not certificate.image_file or created:
-            from .certificate_generator import save_certificate_image
-            
-            student_name = f"{request.user.first_name} {request.user.last_name}"
-            certificate_id = certificate.certificate_id
-            
-            save_certificate_image(
-                certificate=certificate,
-                student_name=student_name,
-                course_title=enrollment.course.title,
-                certificate_id=certificate_id,
-                issued_date=certificate.issued_at,
-                completed_date=enrollment.completed_at
-            )
-        
-        serializer = CertificateSerializer(certificate, context={'request': request})
-        
-        if created:
-            return Response({
-                'message': 'Certificate generated successfully',
-                'certificate': serializer.data
-            }, status=status.HTTP_201_CREATED)
-        else:
-            return Response({
-                'message': 'Certificate already exists',
-                'certificate': serializer.data
-            }, status=status.HTTP_200_OK)
-            
-    except Exception as e:
-        import traceback
-        return Response(
-            {'error': str(e), 'traceback': traceback.format_exc()},
-            status=status.HTTP_400_BAD_REQUEST
-        )
-
-
-@api_view(['GET'])
-@permission_classes([permissions.IsAuthenticated])
-def get_certificate_detail(request, certificate_id):
-    """Get details of a specific certificate"""
-    if request.user.role != 'student':
-        return Response(
-            {'error': 'Only students can access certificates'},
-            status=status.HTTP_403_FORBIDDEN
-        )
-    
-    try:
-        certificate = get_object_or_404(
-            Certificate,
-            id=certificate_id,
-            student=request.user
-        )
-        
-        serializer = CertificateSerializer(certificate)
-        return Response(serializer.data)
-        
-    except Exception as e:
-        return Response(
-            {'error': str(e)},
-            status=status.HTTP_400_BAD_REQUEST
-        )
-
-
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def get_tutor_dashboard_stats(request):
@@ -869,116 +760,6 @@ def get_tutor_dashboard_stats(request):
     return Response(stats)
 
 
-@api_view(['GET'])
-@permission_classes([permissions.IsAuthenticated])
-def get_student_certificates(request):
-    """Get all certificates for the authenticated student"""
-    if request.user.role != 'student':
-        return Response(
-            {'error': 'Only students can access certificates'},
-            status=status.HTTP_403_FORBIDDEN
-        )
-    
-    certificates = Certificate.objects.filter(
-        student=request.user
-    ).select_related('course', 'enrollment').order_by('-issued_at')
-    
-    serializer = CertificateSerializer(certificates, many=True, context={'request': request})
-    return Response(serializer.data)
-
-
-@api_view(['POST'])
-@permission_classes([permissions.IsAuthenticated])
-def generate_certificate(request, enrollment_id):
-    """Generate a certificate for a completed course"""
-    if request.user.role != 'student':
-        return Response(
-            {'error': 'Only students can generate certificates'},
-            status=status.HTTP_403_FORBIDDEN
-        )
-    
-    try:
-        enrollment = get_object_or_404(
-            Enrollment,
-            id=enrollment_id,
-            student=request.user,
-            is_completed=True
-        )
-        
-        # Check if certificate already exists
-        certificate, created = Certificate.objects.get_or_create(
-            student=request.user,
-            course=enrollment.course,
-            enrollment=enrollment,
-            defaults={
-                'certificate_id': f"C{abs(hash(str(enrollment.id))) % 10000:04d}"  # 5 characters: C + 4-digit number
-            }
-        )
-        
-        # Generate PNG certificate image if it doesn't exist or if newly created
-        if not certificate.image_file or created:
-            from .certificate_generator import save_certificate_image
-            
-            student_name = f"{request.user.first_name} {request.user.last_name}"
-            certificate_id = certificate.certificate_id
-            
-            save_certificate_image(
-                certificate=certificate,
-                student_name=student_name,
-                course_title=enrollment.course.title,
-                certificate_id=certificate_id,
-                issued_date=certificate.issued_at,
-                completed_date=enrollment.completed_at
-            )
-        
-        serializer = CertificateSerializer(certificate, context={'request': request})
-        
-        if created:
-            return Response({
-                'message': 'Certificate generated successfully',
-                'certificate': serializer.data
-            }, status=status.HTTP_201_CREATED)
-        else:
-            return Response({
-                'message': 'Certificate already exists',
-                'certificate': serializer.data
-            }, status=status.HTTP_200_OK)
-            
-    except Exception as e:
-        import traceback
-        return Response(
-            {'error': str(e), 'traceback': traceback.format_exc()},
-            status=status.HTTP_400_BAD_REQUEST
-        )
-
-
-@api_view(['GET'])
-@permission_classes([permissions.IsAuthenticated])
-def get_certificate_detail(request, certificate_id):
-    """Get details of a specific certificate"""
-    if request.user.role != 'student':
-        return Response(
-            {'error': 'Only students can access certificates'},
-            status=status.HTTP_403_FORBIDDEN
-        )
-    
-    try:
-        certificate = get_object_or_404(
-            Certificate,
-            id=certificate_id,
-            student=request.user
-        )
-        
-        serializer = CertificateSerializer(certificate)
-        return Response(serializer.data)
-        
-    except Exception as e:
-        return Response(
-            {'error': str(e)},
-            status=status.HTTP_400_BAD_REQUEST
-        )
-
-
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def get_student_dashboard_stats(request):
@@ -1080,8 +861,10 @@ def generate_certificate(request, enrollment_id):
             }
         )
         
-        # Generate PNG certificate image if it doesn't exist or if newly created
-        if not certificate.image_file or created:
+        # Render the certificate image if it doesn't exist or if newly created.
+        # With CERTIFICATE_IMAGES_DEFERRED the scheduled render_certificates command picks it up instead.
+        image_pending = not certificate.image_file or created
+        if image_pending and not settings.CERTIFICATE_IMAGES_DEFERRED:
             from .certificate_generator import save_certificate_image
             
             student_name = f"{request.user.first_name} {request.user.last_name}"
@@ -1095,18 +878,21 @@ def generate_certificate(request, enrollment_id):
                 issued_date=certificate.issued_at,
                 completed_date=enrollment.completed_at
             )
+            image_pending = False
         
         serializer = CertificateSerializer(certificate, context={'request': request})
         
         if created:
             return Response({
                 'message': 'Certificate generated successfully',
-                'certificate': serializer.data
+                'certificate': serializer.data,
+                'image_pending': image_pending
             }, status=status.HTTP_201_CREATED)
         else:
             return Response({
                 'message': 'Certificate already exists',
-                'certificate': serializer.data
+                'certificate': serializer.data,
+                'image_pending': image_pending
             }, status=status.HTTP_200_OK)
             
     except Exception as e:
@@ -5,6 +5,7 @@ Django settings for lms_backend project.
 from pathlib import Path
 from datetime import timedelta
 import os
+from importlib.util import find_spec
 from decouple import config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -57,6 +58,10 @@ MIDDLEWARE = [
     'whitenoise.middleware.WhiteNoiseMiddleware',
 ]
 
+# Per-request query counts in development; opt in with `pip install django-querycount`
+if DEBUG and find_spec('querycount'):
+    MIDDLEWARE.append('querycount.middleware.QueryCountMiddleware')
+
 ROOT_URLCONF = 'lms_backend.urls'
 
 TEMPLATES = [
@@ -89,12 +94,18 @@ if config('MYSQL_DATABASE', default=''):
             'PASSWORD': config('MYSQL_PASSWORD', default=''),
             'HOST': config('MYSQL_HOST', default='localhost'),
             'PORT': config('MYSQL_PORT', default='3306'),
+            # Reuse connections across requests; health checks drop ones the server closed
+            'CONN_MAX_AGE': config('MYSQL_CONN_MAX_AGE', default=60, cast=int),
+            'CONN_HEALTH_CHECKS': True,
             'OPTIONS': {
                 'charset': 'utf8mb4',
                 'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
             },
         }
     }
+    # MySQL can't enforce conditional unique constraints (Payment's one-pending rule);
+    # Django skips them there and the views' row locks cover it, so drop the warning
+    SILENCED_SYSTEM_CHECKS = ['models.W036']
 else:
     DATABASES = {
         'default': {
@@ -103,6 +114,23 @@ else:
         }
     }
 
+# Cache — throttle counters live here.
+# If REDIS_URL is set → Redis, shared by every worker (needs the `redis` package from
+# requirements.txt); otherwise → per-process memory.
+if config('REDIS_URL', default=''):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': config('REDIS_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -161,6 +189,7 @@ REST_FRAMEWORK = {
         'register': '3/minute',
         'otp_verify': '5/minute',
         'otp_resend': '3/hour',
+        'otp_per_account': '20/hour',
         'support_chat': '15/minute',
         'support_contact': '5/hour',
     },
@@ -216,12 +245,19 @@ EMAIL_USE_TLS = True
 EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='lemuelemmanuel29@gmail.com')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='rpdceoywlbcxddoy')
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='lemuelemmanuel29@gmail.com')
+# Send OTP emails from a background thread. Leave off on PythonAnywhere: its uWSGI
+# workers don't run app-started threads, so queued emails would never go out.
+OTP_EMAIL_ASYNC = config('OTP_EMAIL_ASYNC', default=False, cast=bool)
 
 # Flutterwave Configuration
 FLUTTERWAVE_PUBLIC_KEY = config('FLUTTERWAVE_PUBLIC_KEY', default='')
 FLUTTERWAVE_SECRET_KEY = config('FLUTTERWAVE_SECRET_KEY', default='')
 FLUTTERWAVE_ENCRYPTION_KEY = config('FLUTTERWAVE_ENCRYPTION_KEY', default='')
 
+# Leave new certificate images for a scheduled `manage.py render_certificates`
+# instead of rendering them in the request
+CERTIFICATE_IMAGES_DEFERRED = config('CERTIFICATE_IMAGES_DEFERRED', default=False, cast=bool)
+
 # Frontend URL for payment redirects
 FRONTEND_URL = config('FRONTEND_URL', default='http://localhost:3000')
 
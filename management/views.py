@@ -2,7 +2,7 @@ from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
-from django.http import HttpResponse
+from django.http import FileResponse
 
 from .models import CourseCatalog, StudentRecord, ManualCertificate
 from .serializers import (
@@ -181,7 +181,8 @@ class GenerateManualCertificateView(APIView):
             grade=certificate.grade,
         )
 
-        response = HttpResponse(img_buffer.read(), content_type='image/png')
+        # Stream the render buffer as-is instead of copying its bytes out
+        response = FileResponse(img_buffer, content_type='image/png')
         safe_name = certificate.recipient_name.replace(' ', '_')
         response['Content-Disposition'] = (
             f'attachment; filename="certificate_{certificate.certificate_id}_{safe_name}.png"'